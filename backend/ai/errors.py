@@ -0,0 +1,21 @@
+"""Errors raised by the LLM gateway and its providers."""
+
+
+class LLMError(Exception):
+    """An LLM call failed; the message is safe to return to the client."""
+
+
+class LLMUnavailable(LLMError):
+    """The provider is not usable at all (missing library or API key)."""
+
+
+class LLMBusy(LLMError):
+    """No concurrency slot freed up in time."""
+
+
+class TransientLLMError(LLMError):
+    """A failure worth retrying: connection errors, rate limits, 5xx."""
+
+
+class LLMTimeout(TransientLLMError):
+    """The call ran past its deadline."""
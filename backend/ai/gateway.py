@@ -0,0 +1,331 @@
+"""
+Process-wide gateway for every LLM call in the backend.
+
+All callers (chat, JD analysis) go through one Gateway, which owns the
+provider and its pooled client, and adds what the call sites used to lack:
+
+- a deadline per call (LLM_TIMEOUT) that covers every retry;
+- retries with jittered exponential backoff on transient errors;
+- a cap on concurrent calls (LLM_MAX_CONCURRENCY), waiting at most
+  LLM_QUEUE_TIMEOUT for a slot before raising LLMBusy;
+- per-caller latency and token metrics, exposed at /api/ai/stats/.
+
+LLM_PROVIDER selects the backend: "openai" (default) or "fake", a
+deterministic local provider whose latency is set by LLM_FAKE_LATENCY_MS.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from django.conf import settings
+
+from .errors import LLMBusy, LLMError, LLMTimeout, TransientLLMError
+from .providers import FakeProvider, OpenAIProvider, Usage
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))
+LLM_FAKE_LATENCY_MS = int(os.getenv("LLM_FAKE_LATENCY_MS", "200"))
+
+LATENCY_SAMPLES = 512
+
+
+class _Metrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            return round(ordered[int(p * (len(ordered) - 1))] * 1000) if ordered else 0
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_ms_p50": pct(0.5),
+            "latency_ms_p95": pct(0.95),
+        }
+
+
+class Gateway:
+    """Deadlines, retries, a concurrency cap and metrics around one provider."""
+
+    def __init__(
+        self,
+        provider,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+    ):
+        self.provider = provider
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self.in_flight = 0
+
+    def _record(self, caller: str, **counts):
+        with self._lock:
+            metrics = self._metrics.setdefault(caller, _Metrics())
+            latency = counts.pop("latency", None)
+            if latency is not None:
+                metrics.latencies.append(latency)
+            for name, value in counts.items():
+                setattr(metrics, name, getattr(metrics, name) + value)
+
+    @contextmanager
+    def _slot(self, deadline: float):
+        if not self._slots.acquire(
+            timeout=max(0.0, min(self.queue_timeout, deadline - time.monotonic()))
+        ):
+            raise LLMBusy("Too many LLM requests in flight, try again shortly")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    @asynccontextmanager
+    async def _aslot(self, deadline: float):
+        # poll rather than block a worker thread, so a cancelled wait cannot leak a slot
+        give_up = time.monotonic() + max(0.0, min(self.queue_timeout, deadline - time.monotonic()))
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= give_up:
+                raise LLMBusy("Too many LLM requests in flight, try again shortly")
+            await asyncio.sleep(0.05)
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def _backoff(self, attempt: int, deadline: float) -> bool:
+        """Sleep before retry ``attempt``; False if the deadline leaves no room."""
+        delay = random.uniform(0, LLM_RETRY_BACKOFF * 2**attempt)
+        if time.monotonic() + delay >= deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+    def complete(
+        self, messages: list, model: str, caller: str = "default", timeout=None, **options
+    ):
+        """Return a providers.Completion; ``options`` are temperature, max_tokens and json."""
+        started = time.monotonic()
+        deadline = started + (timeout or self.timeout)
+        attempt = 0
+        try:
+            with self._slot(deadline):
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise LLMTimeout("LLM call ran past its deadline")
+                    try:
+                        result = self.provider.complete(messages, model, remaining, **options)
+                        break
+                    except TransientLLMError as e:
+                        if attempt >= self.max_retries or not self._backoff(attempt, deadline):
+                            raise
+                        print(f"LLM call failed ({e}), retrying")
+                        attempt += 1
+        except Exception as e:
+            self._record(
+                caller, calls=1, errors=1, retries=attempt, timeouts=isinstance(e, LLMTimeout)
+            )
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"LLM call failed: {e}") from e
+
+        self._record(
+            caller,
+            calls=1,
+            retries=attempt,
+            prompt_tokens=result.prompt_tokens,
+            completion_tokens=result.completion_tokens,
+            latency=time.monotonic() - started,
+        )
+        return result
+
+    def stream(self, messages: list, model: str, caller: str = "default", timeout=None, **options):
+        """Yield text chunks; only failures before the first chunk are retried."""
+        started = time.monotonic()
+        deadline = started + (timeout or self.timeout)
+        attempt = 0
+        usage = Usage()
+        chunks = None
+        try:
+            with self._slot(deadline):
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise LLMTimeout("LLM call ran past its deadline")
+                    chunks = self.provider.stream(messages, model, remaining, usage, **options)
+                    try:
+                        first = next(chunks, None)
+                    except TransientLLMError as e:
+                        if attempt >= self.max_retries or not self._backoff(attempt, deadline):
+                            raise
+                        print(f"LLM stream failed ({e}), retrying")
+                        attempt += 1
+                        continue
+                    if first is not None:
+                        yield first
+                        for chunk in chunks:
+                            if time.monotonic() > deadline:
+                                raise LLMTimeout("LLM stream ran past its deadline")
+                            yield chunk
+                    break
+        except GeneratorExit:
+            # the consumer went away; count the call but not as an error
+            self._record(caller, calls=1, retries=attempt, cancelled=1)
+            raise
+        except Exception as e:
+            self._record(
+                caller, calls=1, errors=1, retries=attempt, timeouts=isinstance(e, LLMTimeout)
+            )
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"LLM call failed: {e}") from e
+        finally:
+            if chunks is not None:
+                chunks.close()
+
+        self._record(
+            caller,
+            calls=1,
+            retries=attempt,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            latency=time.monotonic() - started,
+        )
+
+    async def astream(
+        self, messages: list, model: str, caller: str = "default", timeout=None, **options
+    ):
+        """Async version of stream(), for ASGI views.
+
+        Closing the generator (or cancelling the task iterating it) closes the
+        provider's stream, which drops the upstream request.
+        """
+        started = time.monotonic()
+        deadline = started + (timeout or self.timeout)
+        attempt = 0
+        usage = Usage()
+        chunks = None
+        try:
+            async with self._aslot(deadline):
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise LLMTimeout("LLM call ran past its deadline")
+                    chunks = self.provider.astream(messages, model, remaining, usage, **options)
+                    try:
+                        first = await asyncio.wait_for(anext(chunks, None), remaining)
+                    except asyncio.TimeoutError:
+                        raise LLMTimeout("LLM call ran past its deadline") from None
+                    except TransientLLMError as e:
+                        delay = random.uniform(0, LLM_RETRY_BACKOFF * 2**attempt)
+                        if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                            raise
+                        print(f"LLM stream failed ({e}), retrying")
+                        await chunks.aclose()
+                        await asyncio.sleep(delay)
+                        attempt += 1
+                        continue
+                    if first is not None:
+                        yield first
+                        while True:
+                            remaining = deadline - time.monotonic()
+                            try:
+                                chunk = await asyncio.wait_for(anext(chunks, None), remaining)
+                            except asyncio.TimeoutError:
+                                raise LLMTimeout("LLM stream ran past its deadline") from None
+                            if chunk is None:
+                                break
+                            yield chunk
+                    break
+        except (GeneratorExit, asyncio.CancelledError):
+            self._record(caller, calls=1, retries=attempt, cancelled=1)
+            raise
+        except Exception as e:
+            self._record(
+                caller, calls=1, errors=1, retries=attempt, timeouts=isinstance(e, LLMTimeout)
+            )
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"LLM call failed: {e}") from e
+        finally:
+            if chunks is not None:
+                await chunks.aclose()
+
+        self._record(
+            caller,
+            calls=1,
+            retries=attempt,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            latency=time.monotonic() - started,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "provider": self.provider.name,
+                "in_flight": self.in_flight,
+                "callers": {name: m.stats() for name, m in self._metrics.items()},
+            }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def build_provider(name: str = LLM_PROVIDER):
+    if name == "fake":
+        return FakeProvider(latency_ms=LLM_FAKE_LATENCY_MS)
+    if name == "openai":
+        return OpenAIProvider(settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY"))
+    raise LLMError(f"Unknown LLM provider: {name}")
+
+
+def get_gateway() -> Gateway:
+    """Return the process-wide gateway, building it on first use.
+
+    Raises LLMUnavailable when the configured provider cannot be set up;
+    nothing is cached in that case, so fixing the config takes effect.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Gateway(build_provider())
+        return _default
@@ -0,0 +1,216 @@
+"""
+LLM providers behind the gateway.
+
+A provider turns one chat request into a Completion (``complete``) or a
+stream of text chunks (``stream``). It makes exactly one attempt within the
+timeout it is given; retries, deadlines and concurrency are the gateway's
+job. Transient failures are raised as TransientLLMError so the gateway knows
+they are worth retrying.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+
+from .errors import LLMTimeout, LLMUnavailable, TransientLLMError
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+
+class Completion:
+    """Text of one completion plus the usage the provider reported for it."""
+
+    def __init__(self, text: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.text = text
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class Usage:
+    def __init__(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class Provider:
+    """Interface every backend implements."""
+
+    name = "base"
+
+    def complete(self, messages: list, model: str, timeout: float, **options) -> Completion:
+        raise NotImplementedError
+
+    def stream(self, messages: list, model: str, timeout: float, usage: Usage, **options):
+        """Yield text chunks; fill in ``usage`` once the stream is done."""
+        raise NotImplementedError
+
+    def astream(self, messages: list, model: str, timeout: float, usage: Usage, **options):
+        """Return an async generator with the same contract as stream()."""
+        raise NotImplementedError
+
+
+class OpenAIProvider(Provider):
+    """OpenAI chat completions over one shared, pooled client."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        if openai is None:
+            raise LLMUnavailable("OpenAI library is not installed")
+        if not api_key:
+            raise LLMUnavailable(
+                "OpenAI API key is not configured. Please set OPENAI_API_KEY in your "
+                "environment variables or .env file."
+            )
+        # the clients keep httpx connection pools; retries happen in the gateway
+        self.client = openai.OpenAI(api_key=api_key, max_retries=0)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    def _kwargs(self, messages, model, timeout, options) -> dict:
+        kwargs = {"model": model, "messages": messages, "timeout": timeout}
+        if options.get("temperature") is not None:
+            kwargs["temperature"] = options["temperature"]
+        if options.get("max_tokens"):
+            kwargs["max_tokens"] = options["max_tokens"]
+        if options.get("json"):
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _translate(self, e: Exception):
+        if isinstance(e, openai.APITimeoutError):
+            return LLMTimeout(str(e))
+        if isinstance(
+            e, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+        ):
+            return TransientLLMError(str(e))
+        return e
+
+    def complete(self, messages, model, timeout, **options) -> Completion:
+        try:
+            resp = self.client.chat.completions.create(
+                **self._kwargs(messages, model, timeout, options)
+            )
+        except Exception as e:
+            raise self._translate(e) from e
+        usage = resp.usage
+        return Completion(
+            resp.choices[0].message.content or "",
+            resp.model,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+        )
+
+    def stream(self, messages, model, timeout, usage, **options):
+        try:
+            chunks = self.client.chat.completions.create(
+                **self._kwargs(messages, model, timeout, options),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except Exception as e:
+            raise self._translate(e) from e
+        try:
+            for chunk in chunks:
+                if chunk.usage:
+                    usage.prompt_tokens = chunk.usage.prompt_tokens
+                    usage.completion_tokens = chunk.usage.completion_tokens
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise self._translate(e) from e
+        finally:
+            # also runs when the consumer stops early, dropping the upstream request
+            chunks.close()
+
+    async def astream(self, messages, model, timeout, usage, **options):
+        try:
+            chunks = await self.async_client.chat.completions.create(
+                **self._kwargs(messages, model, timeout, options),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except Exception as e:
+            raise self._translate(e) from e
+        try:
+            async for chunk in chunks:
+                if chunk.usage:
+                    usage.prompt_tokens = chunk.usage.prompt_tokens
+                    usage.completion_tokens = chunk.usage.completion_tokens
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise self._translate(e) from e
+        finally:
+            await chunks.close()
+
+
+class FakeProvider(Provider):
+    """Deterministic local backend for offline runs and load tests.
+
+    The reply depends only on the messages, and arrives after ``latency_ms``
+    (spread across the chunks when streaming). JSON mode returns an object
+    with a single ``reply`` field.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency_ms: int = 200):
+        self.latency_ms = latency_ms
+
+    def _reply(self, messages: list, options: dict) -> str:
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+        last = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        words = last.split()[:30]
+        reply = f"[fake {digest[:8]}] You said: {' '.join(words)}"
+        if options.get("json"):
+            return json.dumps({"reply": reply})
+        return reply
+
+    @staticmethod
+    def _tokens(text: str) -> int:
+        return (len(text) + 3) // 4
+
+    def _sleep(self, seconds: float, timeout: float):
+        if seconds > timeout:
+            time.sleep(max(timeout, 0))
+            raise LLMTimeout("fake provider timed out")
+        time.sleep(seconds)
+
+    def complete(self, messages, model, timeout, **options) -> Completion:
+        self._sleep(self.latency_ms / 1000, timeout)
+        text = self._reply(messages, options)
+        prompt = sum(self._tokens(m["content"]) for m in messages)
+        return Completion(text, model, prompt, self._tokens(text))
+
+    def _pieces(self, text: str) -> list:
+        return [text[i : i + 16] for i in range(0, len(text), 16)] or [""]
+
+    def _usage(self, usage: Usage, messages: list, text: str):
+        usage.prompt_tokens = sum(self._tokens(m["content"]) for m in messages)
+        usage.completion_tokens = self._tokens(text)
+
+    def stream(self, messages, model, timeout, usage, **options):
+        text = self._reply(messages, options)
+        pieces = self._pieces(text)
+        started = time.monotonic()
+        for piece in pieces:
+            left = timeout - (time.monotonic() - started)
+            self._sleep(self.latency_ms / 1000 / len(pieces), left)
+            yield piece
+        self._usage(usage, messages, text)
+
+    async def astream(self, messages, model, timeout, usage, **options):
+        # the gateway enforces the deadline around each chunk
+        text = self._reply(messages, options)
+        pieces = self._pieces(text)
+        for piece in pieces:
+            await asyncio.sleep(self.latency_ms / 1000 / len(pieces))
+            yield piece
+        self._usage(usage, messages, text)
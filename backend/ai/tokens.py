@@ -0,0 +1,48 @@
+"""
+Token counting shared by everything that budgets LLM input.
+
+Counts come from tiktoken when it is installed and are estimated at four
+characters per token otherwise.
+"""
+
+try:
+    import tiktoken
+except ImportError:  # estimate instead
+    tiktoken = None
+
+TOKENIZER_ENCODING = "o200k_base"  # gpt-4o family
+MESSAGE_OVERHEAD = 4  # role and separators around each chat message
+
+_encoding = None
+_encoding_failed = False
+
+
+def count_tokens(text: str) -> int:
+    global _encoding, _encoding_failed
+    if tiktoken is not None and not _encoding_failed:
+        try:
+            if _encoding is None:
+                _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            return len(_encoding.encode(text, disallowed_special=()))
+        except Exception as e:  # the encoding file could not be loaded
+            print(f"tiktoken unavailable, estimating tokens: {e}")
+            _encoding_failed = True
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(messages: list) -> int:
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    """Return the longest prefix of ``text`` that fits in ``budget`` tokens."""
+    if budget <= 0:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text, disallowed_special=())[:budget])
+    cut = text[: budget * 4]
+    # end on a word boundary when there is one
+    space = cut.rfind(" ")
+    return cut[:space] if space > 0 else cut
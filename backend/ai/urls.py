@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import chat
+from .views import chat, llm_stats
 
 urlpatterns = [
     path("chat/", chat, name="ai-chat"),
+    path("stats/", llm_stats, name="ai-llm-stats"),
 ]
@@ -1,12 +1,28 @@
 # backend/ai/views.py
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
+from api.response_cache import chat_cache
+
+from .errors import LLMError
+from .gateway import get_gateway
+
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def chat(request):
     msg = request.data.get("message", "")
     return Response({"reply": f"[stub] You said: {msg}"}, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def llm_stats(request):
+    try:
+        out = get_gateway().stats()
+    except LLMError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    out["chat_cache"] = chat_cache.stats()
+    return Response(out, status=status.HTTP_200_OK)
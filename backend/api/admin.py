@@ -1 +1,17 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import Conversation, ConversationMessage
+
+
+class ConversationMessageInline(admin.TabularInline):
+    model = ConversationMessage
+    extra = 0
+    readonly_fields = ("seq", "role", "content", "tokens", "created_at")
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "title", "summarized_through", "updated_at")
+    search_fields = ("title", "user__username")
+    readonly_fields = ("created_at", "updated_at")
+    inlines = [ConversationMessageInline]
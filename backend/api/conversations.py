@@ -0,0 +1,147 @@
+"""
+Server-side chat history with a token-budgeted context window.
+
+The client sends only its new message; the conversation lives in the
+Conversation / ConversationMessage tables. Each request's context is the
+system prompt, the conversation's running summary and as many recent
+messages as fit in CHAT_CONTEXT_TOKENS. When the unsummarized messages no
+longer fit, the oldest are folded into the summary with one LLM call, until
+the rest take at most half the window, so the summary is only rewritten
+every few turns and is stored for the requests after it.
+
+A user's message is stored together with the reply to it, once the reply is
+complete, so a failed or abandoned call leaves no unanswered turn behind. A
+new conversation is saved with its first exchange for the same reason.
+"""
+
+import os
+
+from django.db import transaction
+from django.db.models import Max
+
+from ai.errors import LLMError
+from ai.gateway import get_gateway
+from ai.tokens import MESSAGE_OVERHEAD, count_tokens
+
+from .models import Conversation, ConversationMessage
+
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "3000"))
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", "300"))
+SUMMARY_MODEL = "gpt-4o-mini"
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and a career \
+assistant. Keep facts about the user (target roles, companies, experience, deadlines), \
+decisions and open questions; drop pleasantries. Reply with the new summary only, in at most \
+{max_words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+def get_conversation(user, conversation_id=None) -> Conversation:
+    """Return the user's conversation, or a new, unsaved one when ``conversation_id`` is None.
+
+    Raises Conversation.DoesNotExist for ids that are not this user's.
+    """
+    if conversation_id is None:
+        return Conversation(user=user)
+    return Conversation.objects.get(pk=conversation_id, user=user)
+
+
+def _message(role: str, content: str, **fields) -> ConversationMessage:
+    return ConversationMessage(
+        role=role, content=content, tokens=count_tokens(content) + MESSAGE_OVERHEAD, **fields
+    )
+
+
+def add_exchange(conversation: Conversation, message: str, reply: str):
+    """Store a user message and the assistant's reply to it, saving a new conversation."""
+    with transaction.atomic():
+        if not conversation.title:
+            conversation.title = message[:200]
+        if conversation._state.adding:
+            conversation.save()
+            last = 0
+        else:
+            conversation.save(update_fields=["title", "updated_at"])
+            last = conversation.messages.aggregate(last=Max("seq"))["last"] or 0
+        ConversationMessage.objects.bulk_create(
+            [
+                _message(
+                    ConversationMessage.Role.USER, message, conversation=conversation, seq=last + 1
+                ),
+                _message(
+                    ConversationMessage.Role.ASSISTANT,
+                    reply,
+                    conversation=conversation,
+                    seq=last + 2,
+                ),
+            ]
+        )
+
+
+def _summarize(conversation: Conversation, folded: list):
+    lines = "\n".join(f"{m.role}: {m.content}" for m in folded)
+    prompt = SUMMARY_PROMPT.format(
+        max_words=CHAT_SUMMARY_TOKENS * 3 // 4,
+        summary=conversation.summary or "(none)",
+        messages=lines,
+    )
+    resp = get_gateway().complete(
+        [{"role": "user", "content": prompt}],
+        SUMMARY_MODEL,
+        caller="chat_summary",
+        temperature=0.2,
+        max_tokens=CHAT_SUMMARY_TOKENS,
+    )
+    conversation.summary = resp.text.strip()
+    conversation.summarized_through = folded[-1].seq
+    conversation.save(update_fields=["summary", "summarized_through", "updated_at"])
+
+
+def build_context(conversation: Conversation, system_prompt: str, message: str) -> list:
+    """Return the messages to send for a new user ``message`` in the conversation."""
+    fixed = count_tokens(system_prompt) + MESSAGE_OVERHEAD
+    window = max(CHAT_CONTEXT_TOKENS - fixed - CHAT_SUMMARY_TOKENS, 0)
+    pending = []
+    if not conversation._state.adding:
+        pending = list(conversation.messages.filter(seq__gt=conversation.summarized_through))
+    # not stored yet, and never folded: the loop below always keeps the last message
+    pending.append(_message(ConversationMessage.Role.USER, message))
+
+    if sum(m.tokens for m in pending) > window and len(pending) > 1:
+        # fold the oldest messages until the rest take at most half the window
+        keep = sum(m.tokens for m in pending)
+        cut = 0
+        while cut < len(pending) - 1 and keep > window // 2:
+            keep -= pending[cut].tokens
+            cut += 1
+        try:
+            _summarize(conversation, pending[:cut])
+            pending = pending[cut:]
+        except LLMError as e:
+            # keep going without them; the next request tries to fold them again
+            print(f"Conversation summary failed: {e}")
+
+    recent = []
+    used = 0
+    for message in reversed(pending):
+        # the newest message always goes in, even if it alone is over budget
+        if recent and used + message.tokens > window:
+            break
+        recent.append({"role": message.role, "content": message.content})
+        used += message.tokens
+    recent.reverse()
+
+    messages = [{"role": "system", "content": system_prompt}]
+    if conversation.summary:
+        messages.append(
+            {
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {conversation.summary}",
+            }
+        )
+    return messages + recent
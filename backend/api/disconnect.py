@@ -0,0 +1,57 @@
+"""
+Client-disconnect detection for streamed responses under ASGI.
+
+Django 4.2's ASGI handler stops reading ``receive`` once the request body is
+in, so a view streaming a response never learns that the client left. The
+wrapper below keeps listening after the body and sets an event in the scope
+on ``http.disconnect``; streaming views wait on it to cancel upstream work.
+"""
+
+import asyncio
+
+SCOPE_KEY = "api.disconnected"
+
+
+class DisconnectWatcher:
+    """ASGI middleware that exposes client disconnects as an asyncio.Event."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        disconnected = asyncio.Event()
+        scope[SCOPE_KEY] = disconnected
+        watcher = None
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def wrapped_receive():
+            nonlocal watcher
+            if watcher is not None:
+                # the body is in and watch() owns receive now
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                watcher = asyncio.ensure_future(watch())
+            return message
+
+        try:
+            await self.app(scope, wrapped_receive, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+
+def disconnected_event(request):
+    """The request's disconnect event, or None when not served by DisconnectWatcher."""
+    scope = getattr(request, "scope", None)
+    return scope.get(SCOPE_KEY) if scope else None
@@ -0,0 +1,143 @@
+"""
+In-process cache of chat replies for repeated, mostly context-free questions.
+
+Many chat messages are the same FAQ ("how do I prepare for an OA?") asked
+with no history. A reply is cached under a key built from:
+
+- the user's message, normalized (case, whitespace, punctuation);
+- the prompt version, a hash of the system prompt, model and options, so
+  editing the prompt retires old replies;
+- a fingerprint of the earlier messages, if any.
+
+Only requests with at most CHAT_CACHE_MAX_HISTORY earlier messages are
+cached; longer conversations are too specific to be worth it. Entries expire
+after CHAT_CACHE_TTL seconds and the least recently used are evicted past
+CHAT_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+CHAT_CACHE_TTL = int(os.getenv("CHAT_CACHE_TTL", str(24 * 60 * 60)))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "1024"))
+CHAT_CACHE_MAX_HISTORY = int(os.getenv("CHAT_CACHE_MAX_HISTORY", "2"))
+
+# "+" and "#" carry meaning in C++ / C#
+_PUNCT_RE = re.compile(r"[^\w\s+#]")
+
+
+def normalize_message(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_PUNCT_RE.sub(" ", text).split())
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def prompt_version(system_prompt: str, model: str, options: dict) -> str:
+    return _digest([system_prompt, model, options])[:12]
+
+
+def history_fingerprint(history: list) -> str:
+    return _digest([[m["role"], normalize_message(m["content"])] for m in history])[:16]
+
+
+def chat_cache_key(messages: list, model: str, options: dict):
+    """Return the cache key for ``messages``, or None if they should not be cached.
+
+    ``messages`` is the list sent to the model: the system prompt first and the
+    new user message last.
+    """
+    if len(messages) < 2 or messages[0]["role"] != "system" or messages[-1]["role"] != "user":
+        return None
+    history = messages[1:-1]
+    if len(history) > CHAT_CACHE_MAX_HISTORY:
+        return None
+    question = normalize_message(messages[-1]["content"])
+    if not question:
+        return None
+    version = prompt_version(messages[0]["content"], model, options)
+    return f"{version}:{history_fingerprint(history)}:{_digest(question)[:32]}"
+
+
+class _Entry:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.stored_at = time.monotonic()
+
+
+class ChatResponseCache:
+    """Thread-safe LRU cache of chat replies with a TTL."""
+
+    def __init__(self, ttl: int = CHAT_CACHE_TTL, max_entries: int = CHAT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.uncacheable = 0
+        self.evictions = 0
+
+    def lookup(self, key, bypass: bool = False):
+        """Return the cached reply for ``key``, or None.
+
+        A None key (a conversation too long to cache) and ``bypass`` are
+        counted separately from misses so they do not skew the hit rate.
+        """
+        with self._lock:
+            if key is None:
+                self.uncacheable += 1
+                return None
+            if bypass:
+                self.bypassed += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.reply
+
+    def put(self, key, reply: str):
+        if key is None or not reply:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(reply)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "uncacheable": self.uncacheable,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+chat_cache = ChatResponseCache()
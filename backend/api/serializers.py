@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Item
+from .models import Conversation, ConversationMessage, Item
 
 
 class ItemSerializer(serializers.ModelSerializer):
@@ -11,6 +11,29 @@ class ItemSerializer(serializers.ModelSerializer):
 
 class ChatMessageSerializer(serializers.Serializer):
     message = serializers.CharField(required=True, allow_blank=False)
+    # signed-in clients send conversation_id; history is for anonymous, stateless chats
+    conversation_id = serializers.UUIDField(required=False, allow_null=True)
     conversation_history = serializers.ListField(
         child=serializers.DictField(), required=False, allow_empty=True
     )
+    # skip the reply cache for this request (the fresh reply is still stored)
+    no_cache = serializers.BooleanField(required=False, default=False)
+
+
+class ConversationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Conversation
+        fields = ["id", "title", "created_at", "updated_at"]
+
+
+class ConversationMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ConversationMessage
+        fields = ["seq", "role", "content", "created_at"]
+
+
+class ConversationDetailSerializer(ConversationSerializer):
+    messages = ConversationMessageSerializer(many=True, read_only=True)
+
+    class Meta(ConversationSerializer.Meta):
+        fields = ConversationSerializer.Meta.fields + ["messages"]
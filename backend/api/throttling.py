@@ -0,0 +1,8 @@
+from throttling.buckets import COST_CHAT, CostThrottle
+
+
+class ChatThrottle(CostThrottle):
+    scope = "chat"
+
+    def estimate(self, request) -> float:
+        return COST_CHAT
@@ -1,9 +1,19 @@
 from django.urls import path
 
-from .views import ItemListCreateView, ItemRetrieveView, chat
+from .views import (
+    ConversationDetailView,
+    ConversationListView,
+    ItemListCreateView,
+    ItemRetrieveView,
+    chat,
+    chat_stream,
+)
 
 urlpatterns = [
     path("items/", ItemListCreateView.as_view(), name="item-list-create"),
     path("items/<int:pk>/", ItemRetrieveView.as_view(), name="item-detail"),
     path("chat/", chat, name="chat"),
+    path("chat/stream/", chat_stream, name="chat-stream"),
+    path("conversations/", ConversationListView.as_view(), name="conversation-list"),
+    path("conversations/<uuid:pk>/", ConversationDetailView.as_view(), name="conversation-detail"),
 ]
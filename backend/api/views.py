@@ -1,16 +1,38 @@
-from django.conf import settings
+import asyncio
+import json
+import math
+from contextlib import suppress
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Item
-from .serializers import ChatMessageSerializer, ItemSerializer
+from ai.errors import LLMBusy, LLMError, LLMTimeout, LLMUnavailable
+from ai.gateway import get_gateway
+from throttling.buckets import COST_CACHE_HIT, COST_CHAT, record_cost
+
+from .conversations import add_exchange, build_context, get_conversation
+from .disconnect import disconnected_event
+from .models import Conversation, Item
+from .response_cache import chat_cache, chat_cache_key
+from .serializers import (
+    ChatMessageSerializer,
+    ConversationDetailSerializer,
+    ConversationSerializer,
+    ItemSerializer,
+)
+from .throttling import ChatThrottle
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None
+CHAT_MODEL = "gpt-4o-mini"
+CHAT_OPTIONS = {"temperature": 0.7, "max_tokens": 1000}
+CHAT_SYSTEM_PROMPT = "You are a helpful AI assistant for a job application tracking system. Help users with job search, resume advice, interview preparation, and career guidance."
 
 
 class ItemListCreateView(generics.ListCreateAPIView):
@@ -23,60 +45,238 @@ class ItemRetrieveView(generics.RetrieveAPIView):
     serializer_class = ItemSerializer
 
 
+class ConversationListView(generics.ListAPIView):
+    serializer_class = ConversationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Conversation.objects.filter(user=self.request.user)
+
+
+class ConversationDetailView(generics.RetrieveDestroyAPIView):
+    serializer_class = ConversationDetailSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Conversation.objects.filter(user=self.request.user).prefetch_related("messages")
+
+
+def _chat_messages(message: str, conversation_history: list) -> list:
+    messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
+    for msg in conversation_history:
+        if isinstance(msg, dict) and "role" in msg and "content" in msg:
+            messages.append({"role": msg["role"], "content": msg["content"]})
+    messages.append({"role": "user", "content": message})
+    return messages
+
+
+def _start_chat(user, data: dict) -> tuple:
+    """Return ``(conversation, messages)`` for a validated chat request.
+
+    Signed-in users get a stored conversation and send only the new message;
+    anonymous requests keep the stateless ``conversation_history`` form and
+    get ``None`` as the conversation.
+    """
+    if user is None or not user.is_authenticated:
+        return None, _chat_messages(data["message"], data.get("conversation_history", []))
+    conversation = get_conversation(user, data.get("conversation_id"))
+    return conversation, build_context(conversation, CHAT_SYSTEM_PROMPT, data["message"])
+
+
+def _cached_reply(messages: list, data: dict) -> tuple:
+    """Return ``(cache_key, reply)``; ``reply`` is None unless the cache had it."""
+    key = chat_cache_key(messages, CHAT_MODEL, CHAT_OPTIONS)
+    reply = chat_cache.lookup(key, bypass=data.get("no_cache", False))
+    if reply is not None:
+        # the throttle charged for a model call that is not going to happen
+        record_cost(COST_CACHE_HIT - COST_CHAT, scope="chat_cache")
+    return key, reply
+
+
+def _finish_chat(conversation, messages: list, reply: str) -> dict:
+    """Store the completed exchange; nothing is stored for failed or abandoned calls."""
+    if conversation is None:
+        return {"response": reply}
+    add_exchange(conversation, messages[-1]["content"], reply)
+    return {"response": reply, "conversation_id": str(conversation.id)}
+
+
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([ChatThrottle])
 def chat(request):
     """Chat with OpenAI API"""
-    if not OpenAI:
-        return Response(
-            {"error": "OpenAI library is not installed"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-
     serializer = ChatMessageSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    message = serializer.validated_data["message"]
-    conversation_history = serializer.validated_data.get("conversation_history", [])
+    try:
+        gateway = get_gateway()
+    except LLMUnavailable as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    try:
+        conversation, messages = _start_chat(request.user, serializer.validated_data)
+    except Conversation.DoesNotExist:
+        return Response({"error": "Conversation not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    # 获取OpenAI API key
-    api_key = getattr(settings, "OPENAI_API_KEY", None)
-    if not api_key:
+    key, cached = _cached_reply(messages, serializer.validated_data)
+    if cached is not None:
         return Response(
-            {
-                "error": "OpenAI API key is not configured. Please set OPENAI_API_KEY in your environment variables or .env file."
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {**_finish_chat(conversation, messages, cached), "cached": True},
+            status=status.HTTP_200_OK,
         )
 
     try:
-        client = OpenAI(api_key=api_key)
-
-        messages = []
-        messages.append(
-            {
-                "role": "system",
-                "content": "You are a helpful AI assistant for a job application tracking system. Help users with job search, resume advice, interview preparation, and career guidance.",
-            }
+        response = gateway.complete(messages, CHAT_MODEL, caller="chat", **CHAT_OPTIONS)
+    except LLMBusy as e:
+        return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except LLMTimeout as e:
+        return Response(
+            {"error": f"Failed to get AI response: {e}"},
+            status=status.HTTP_504_GATEWAY_TIMEOUT,
+        )
+    except LLMError as e:
+        return Response(
+            {"error": f"Failed to get AI response: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-        for msg in conversation_history:
-            if isinstance(msg, dict) and "role" in msg and "content" in msg:
-                messages.append({"role": msg["role"], "content": msg["content"]})
+    chat_cache.put(key, response.text)
+    return Response(_finish_chat(conversation, messages, response.text), status=status.HTTP_200_OK)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _replay(reply: str):
+    yield reply
+
+
+async def _chat_events(gateway, conversation, messages: list, disconnected, key, cached):
+    if cached is not None:
+        stream = _replay(cached)
+    else:
+        stream = gateway.astream(messages, CHAT_MODEL, caller="chat", **CHAT_OPTIONS)
+    gone = asyncio.ensure_future(disconnected.wait()) if disconnected else None
+    reply = []
+    try:
+        if conversation is not None:
+            yield _sse("conversation", {"conversation_id": str(conversation.id)})
+        while True:
+            step = asyncio.ensure_future(anext(stream, None))
+            if gone is not None:
+                await asyncio.wait({step, gone}, return_when=asyncio.FIRST_COMPLETED)
+                if not step.done():
+                    # cancelling the pending read closes the upstream request
+                    step.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await step
+                    print("Chat client disconnected, upstream request cancelled")
+                    return
+            chunk = await step
+            if chunk is None:
+                break
+            reply.append(chunk)
+            yield _sse("token", {"text": chunk})
+        if cached is None:
+            chat_cache.put(key, "".join(reply))
+        done = await sync_to_async(_finish_chat)(conversation, messages, "".join(reply))
+        yield _sse("done", done)
+    except LLMError as e:
+        yield _sse("error", {"error": f"Failed to get AI response: {e}"})
+    finally:
+        if gone is not None:
+            gone.cancel()
+        await stream.aclose()
 
-        messages.append({"role": "user", "content": message})
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini", messages=messages, temperature=0.7, max_tokens=1000
+def _chat_events_sync(gateway, conversation, messages: list, key, cached):
+    # WSGI fallback: the server closes this generator when the client goes away
+    reply = []
+    try:
+        if conversation is not None:
+            yield _sse("conversation", {"conversation_id": str(conversation.id)})
+        if cached is not None:
+            chunks = [cached]
+        else:
+            chunks = gateway.stream(messages, CHAT_MODEL, caller="chat", **CHAT_OPTIONS)
+        for chunk in chunks:
+            reply.append(chunk)
+            yield _sse("token", {"text": chunk})
+        if cached is None:
+            chat_cache.put(key, "".join(reply))
+        yield _sse("done", _finish_chat(conversation, messages, "".join(reply)))
+    except LLMError as e:
+        yield _sse("error", {"error": f"Failed to get AI response: {e}"})
+
+
+def _authenticate(request):
+    """Token auth for the plain async view; DRF's authenticator only reads headers."""
+    result = TokenAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+async def chat_stream(request):
+    """Chat with OpenAI API, streaming the reply as Server-Sent Events.
+
+    An async view so a slow stream does not hold a worker thread under ASGI;
+    a client disconnect cancels the upstream request.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Method not allowed"}, status=405)
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+    serializer = ChatMessageSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    try:
+        gateway = get_gateway()
+    except LLMUnavailable as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+    try:
+        request.user = await sync_to_async(_authenticate)(request) or AnonymousUser()
+    except AuthenticationFailed as e:
+        return JsonResponse({"error": str(e.detail)}, status=401)
+
+    # DRF runs throttles for api_view functions; this view has to do it itself
+    throttle = ChatThrottle()
+    if not await sync_to_async(throttle.allow_request)(request, None):
+        wait = math.ceil(throttle.wait() or 0)
+        response = JsonResponse(
+            {"error": f"Request was throttled. Expected available in {wait} seconds."},
+            status=429,
         )
+        response["Retry-After"] = str(wait)
+        return response
 
-        ai_response = response.choices[0].message.content
+    try:
+        conversation, messages = await sync_to_async(_start_chat)(
+            request.user, serializer.validated_data
+        )
+    except Conversation.DoesNotExist:
+        return JsonResponse({"error": "Conversation not found"}, status=404)
 
-        return Response({"response": ai_response}, status=status.HTTP_200_OK)
+    key, cached = await sync_to_async(_cached_reply)(messages, serializer.validated_data)
 
-    except Exception as e:
-        return Response(
-            {"error": f"Failed to get AI response: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    if isinstance(request, ASGIRequest):
+        events = _chat_events(
+            gateway, conversation, messages, disconnected_event(request), key, cached
         )
+    else:
+        # WSGI would buffer an async iterator whole before sending it
+        events = _chat_events_sync(gateway, conversation, messages, key, cached)
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# csrf_exempt is not async-aware before Django 5.0; this is the flag it sets
+chat_stream.csrf_exempt = True
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Application, Company, Job
+from .models import Application, Company, Job, JobDescription
 
 
 @admin.register(Company)
@@ -15,6 +15,13 @@ class JobAdmin(admin.ModelAdmin):
     search_fields = ("title",)
 
 
+@admin.register(JobDescription)
+class JobDescriptionAdmin(admin.ModelAdmin):
+    list_display = ("canonical_url", "job", "fetched_at", "changed_at", "analyzed_at")
+    search_fields = ("canonical_url", "job__title", "job__company__name")
+    autocomplete_fields = ["job"]
+
+
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ["user", "job", "status", "applied_at", "created_at"]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0006_remove_company_website_job_website"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobDescription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("canonical_url", models.CharField(max_length=2000, unique=True)),
+                ("text", models.TextField()),
+                ("content_hash", models.CharField(max_length=64)),
+                ("meta", models.JSONField(blank=True, default=dict)),
+                ("analysis", models.JSONField(blank=True, null=True)),
+                ("analysis_version", models.CharField(blank=True, max_length=32)),
+                ("fetched_at", models.DateTimeField()),
+                ("changed_at", models.DateTimeField()),
+                ("analyzed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="descriptions",
+                        to="applications.job",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
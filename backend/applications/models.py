@@ -63,3 +63,26 @@ class Application(TimeStamped):
 
     def __str__(self):
         return f"{self.user} → {self.job} ({self.status})"
+
+
+# extracted posting, shared by every user applying through the same link
+class JobDescription(TimeStamped):
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="descriptions",
+    )
+    canonical_url = models.CharField(max_length=2000, unique=True)
+    text = models.TextField()
+    content_hash = models.CharField(max_length=64)  # sha256 of text
+    meta = models.JSONField(default=dict, blank=True)  # job_title/company/location from the ATS
+    analysis = models.JSONField(null=True, blank=True)
+    analysis_version = models.CharField(max_length=32, blank=True)  # prompt version used
+    fetched_at = models.DateTimeField()  # last successful fetch
+    changed_at = models.DateTimeField()  # last time the text changed
+    analyzed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.canonical_url
@@ -10,12 +10,21 @@ class ApplicationSerializer(serializers.ModelSerializer):
     job_website = serializers.CharField(source="job.website", read_only=True)
     type = serializers.CharField(source="job.get_type_display", read_only=True)
     time = serializers.DateTimeField(source="applied_at", read_only=True)
+    skills = serializers.SerializerMethodField()
 
     class Meta:
         model = Application
         fields = "__all__"
         read_only_fields = ["id", "user", "created_at", "updated_at"]
 
+    def get_skills(self, obj):
+        # most recently fetched description attached to the job, if any
+        descriptions = sorted(obj.job.descriptions.all(), key=lambda d: d.fetched_at, reverse=True)
+        for description in descriptions:
+            if description.analysis:
+                return description.analysis.get("flat", [])
+        return []
+
     def validate(self, attrs):
         # do not ban
         if self.instance is None:
@@ -3,14 +3,20 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Application, Company, Job
+from extraction.cache import canonicalize_url
+
+from .models import Application, Company, Job, JobDescription
 from .serializers import ApplicationSerializer
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_applications(request):
-    apps = Application.objects.filter(user=request.user)
+    apps = (
+        Application.objects.filter(user=request.user)
+        .select_related("job__company")
+        .prefetch_related("job__descriptions")
+    )
     serializer = ApplicationSerializer(apps, many=True)
     return Response(serializer.data)
 
@@ -29,6 +35,14 @@ def create_application(request):
             defaults={"website": request.data.get("link", "")},
         )
 
+        # share an already extracted description of this posting with the job,
+        # unless another job already owns it
+        link = request.data.get("link")
+        if link:
+            JobDescription.objects.filter(
+                canonical_url=canonicalize_url(link), job__isnull=True
+            ).update(job=job)
+
         # create application
         application = Application.objects.create(
             user=request.user,
@@ -1 +1,18 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import AnalysisCacheEntry, ExtractionJob
+
+
+@admin.register(ExtractionJob)
+class ExtractionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "url", "status", "stage", "progress", "created_at")
+    list_filter = ("status",)
+    search_fields = ("url", "user__username")
+    readonly_fields = ("created_at", "updated_at", "finished_at")
+
+
+@admin.register(AnalysisCacheEntry)
+class AnalysisCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("key", "model", "prompt_version", "hits", "created_at", "last_used_at")
+    list_filter = ("model", "prompt_version")
+    readonly_fields = ("created_at", "last_used_at")
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class ExtractionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "extraction"
+
+    def ready(self):
+        from .jobs import RESUME_DISPATCH_UID, resume_on_request
+
+        # only serving processes get requests, so migrate and friends never resume jobs
+        request_started.connect(resume_on_request, dispatch_uid=RESUME_DISPATCH_UID)
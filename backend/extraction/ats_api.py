@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+JSON fast paths for ATS boards that publish postings through an API.
+
+Greenhouse, Lever, Ashby, SmartRecruiters and Workday all serve the posting
+as JSON from an endpoint derivable from the public job URL. Reading that
+JSON skips HTML scraping and the browser fallback entirely, and also yields
+the title, company and location.
+"""
+
+import html
+import re
+from urllib.parse import parse_qs, urlparse
+
+from .cleaner import get_cleaner
+from .fetcher import JSON_CONTENT_TYPES, fetcher
+from .sites import container_text, parse_html
+
+GREENHOUSE_PATH_RE = re.compile(r"^/(?P<board>[\w-]+)/jobs/(?P<job_id>\d+)")
+LEVER_PATH_RE = re.compile(r"^/(?P<company>[\w.-]+)/(?P<posting_id>[0-9a-f-]{36})")
+ASHBY_PATH_RE = re.compile(r"^/(?P<org>[^/]+)/(?P<job_id>[0-9a-f-]{36})")
+SMARTRECRUITERS_PATH_RE = re.compile(r"^/(?P<company>[^/]+)/(?P<posting_id>\d+)")
+WORKDAY_PATH_RE = re.compile(r"^(?:/[a-z]{2}-[A-Z]{2})?/(?P<site>[^/]+)/(?P<job_path>job/.+?)/?$")
+
+
+def html_to_text(fragment: str) -> str:
+    root = parse_html(fragment or "")
+    if root is None:
+        return ""
+    return get_cleaner().clean(container_text(root))
+
+
+def _join(*parts) -> str:
+    return ", ".join(p for p in parts if p)
+
+
+class Posting:
+    """A job posting read from an ATS API."""
+
+    def __init__(self, source: str, text: str, title="", company="", location=""):
+        self.source = source
+        self.text = text
+        self.title = title or ""
+        self.company = company or ""
+        self.location = location or ""
+
+    def meta(self) -> dict:
+        return {"job_title": self.title, "company": self.company, "location": self.location}
+
+
+class ApiFastPath:
+    """Maps a job URL to its JSON endpoint and the JSON to a Posting.
+
+    ``base`` overrides the API origin; Workday postings are served from the
+    board's own host when it is None.
+    """
+
+    name = ""
+    hosts = ()
+    base = None
+
+    def match(self, parts):
+        """Return the regex match for a supported URL, or None."""
+        raise NotImplementedError
+
+    def api_url(self, parts, match) -> str:
+        raise NotImplementedError
+
+    def parse(self, data, parts, match):
+        raise NotImplementedError
+
+    def handles(self, host: str) -> bool:
+        return any(host == h or host.endswith("." + h) for h in self.hosts)
+
+
+class GreenhouseApi(ApiFastPath):
+    name = "greenhouse"
+    hosts = ("greenhouse.io",)
+    base = "https://boards-api.greenhouse.io"
+
+    def match(self, parts):
+        match = GREENHOUSE_PATH_RE.match(parts.path)
+        if match is not None:
+            return match
+        # embedded application form: /embed/job_app?for=<board>&token=<job id>
+        query = parse_qs(parts.query)
+        if parts.path.startswith("/embed/job_app") and "for" in query and "token" in query:
+            return {"board": query["for"][0], "job_id": query["token"][0]}
+        return None
+
+    def api_url(self, parts, match) -> str:
+        return f"{self.base}/v1/boards/{match['board']}/jobs/{match['job_id']}"
+
+    def parse(self, data, parts, match):
+        # the boards API returns the description HTML entity-escaped
+        return Posting(
+            self.name,
+            html_to_text(html.unescape(data.get("content", ""))),
+            title=data.get("title"),
+            company=data.get("company_name") or match["board"],
+            location=(data.get("location") or {}).get("name"),
+        )
+
+
+class LeverApi(ApiFastPath):
+    name = "lever"
+    hosts = ("lever.co",)
+    base = "https://api.lever.co"
+
+    def match(self, parts):
+        return LEVER_PATH_RE.match(parts.path)
+
+    def api_url(self, parts, match) -> str:
+        return f"{self.base}/v0/postings/{match['company']}/{match['posting_id']}"
+
+    def parse(self, data, parts, match):
+        sections = [data.get("descriptionPlain", "")]
+        for item in data.get("lists", []):
+            sections.append(item.get("text", ""))
+            sections.append(html_to_text(item.get("content", "")))
+        sections.append(data.get("additionalPlain", ""))
+        categories = data.get("categories") or {}
+        return Posting(
+            self.name,
+            get_cleaner().clean(" ".join(s for s in sections if s)),
+            title=data.get("text"),
+            company=match["company"],
+            location=categories.get("location"),
+        )
+
+
+class AshbyApi(ApiFastPath):
+    name = "ashby"
+    hosts = ("ashbyhq.com",)
+    base = "https://api.ashbyhq.com"
+
+    def match(self, parts):
+        return ASHBY_PATH_RE.match(parts.path)
+
+    def api_url(self, parts, match) -> str:
+        # Ashby only publishes the whole board, so the posting is picked out in parse()
+        return f"{self.base}/posting-api/job-board/{match['org']}"
+
+    def parse(self, data, parts, match):
+        for job in data.get("jobs", []):
+            if job.get("id") == match["job_id"]:
+                text = job.get("descriptionPlain") or html_to_text(job.get("descriptionHtml", ""))
+                return Posting(
+                    self.name,
+                    get_cleaner().clean(text),
+                    title=job.get("title"),
+                    company=match["org"],
+                    location=job.get("location"),
+                )
+        return None
+
+
+class SmartRecruitersApi(ApiFastPath):
+    name = "smartrecruiters"
+    hosts = ("smartrecruiters.com",)
+    base = "https://api.smartrecruiters.com"
+
+    def match(self, parts):
+        return SMARTRECRUITERS_PATH_RE.match(parts.path)
+
+    def api_url(self, parts, match) -> str:
+        return f"{self.base}/v1/companies/{match['company']}/postings/{match['posting_id']}"
+
+    def parse(self, data, parts, match):
+        sections = ((data.get("jobAd") or {}).get("sections")) or {}
+        text = " ".join(
+            html_to_text((sections.get(key) or {}).get("text", ""))
+            for key in (
+                "companyDescription",
+                "jobDescription",
+                "qualifications",
+                "additionalInformation",
+            )
+        )
+        location = data.get("location") or {}
+        return Posting(
+            self.name,
+            get_cleaner().clean(text),
+            title=data.get("name"),
+            company=(data.get("company") or {}).get("name") or match["company"],
+            location=(
+                "Remote"
+                if location.get("remote")
+                else _join(location.get("city"), location.get("region"), location.get("country"))
+            ),
+        )
+
+
+class WorkdayApi(ApiFastPath):
+    name = "workday"
+    hosts = ("myworkdayjobs.com",)
+
+    def match(self, parts):
+        return WORKDAY_PATH_RE.match(parts.path)
+
+    def api_url(self, parts, match) -> str:
+        tenant = parts.hostname.split(".")[0]
+        origin = self.base or f"{parts.scheme}://{parts.netloc}"
+        return f"{origin}/wday/cxs/{tenant}/{match['site']}/{match['job_path']}"
+
+    def parse(self, data, parts, match):
+        info = data.get("jobPostingInfo") or {}
+        return Posting(
+            self.name,
+            html_to_text(info.get("jobDescription", "")),
+            title=info.get("title"),
+            company=(data.get("hiringOrganization") or {}).get("name"),
+            location=info.get("location"),
+        )
+
+
+FAST_PATHS = [GreenhouseApi(), LeverApi(), AshbyApi(), SmartRecruitersApi(), WorkdayApi()]
+
+
+def fetch_posting(url: str):
+    """Return a Posting from the ATS API for ``url``, or None if it has no fast path."""
+    parts = urlparse(url)
+    host = (parts.hostname or "").lower()
+    for fast_path in FAST_PATHS:
+        if not fast_path.handles(host):
+            continue
+        match = fast_path.match(parts)
+        if match is None:
+            return None
+        try:
+            res = fetcher.get(
+                fast_path.api_url(parts, match),
+                headers={"Accept": "application/json"},
+                content_types=JSON_CONTENT_TYPES,
+            )
+            if res.status_code != 200:
+                raise RuntimeError(f"HTTP {res.status_code}")
+            posting = fast_path.parse(res.json(), parts, match)
+        except Exception as e:
+            print(f"{fast_path.name} API failed: {e}")
+            return None
+        if posting is None or not posting.text:
+            return None
+        return posting
+    return None
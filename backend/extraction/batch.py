@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent extraction for a batch of posting URLs.
+
+Fetches go through the shared pooled fetcher on worker threads, with a global
+and a per-host concurrency cap. Pages that need a browser are handed to the
+shared browser pool through a small process-wide render queue, so a 50-link
+import cannot open 50 Chromium pages at once. Results are emitted as each URL finishes.
+When the client goes away the batch stops: pending URLs are cancelled and no
+new fetch, render or LLM call is started.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import queue
+import threading
+from urllib.parse import urlparse
+
+from .cache import canonicalize_url, jd_cache
+from .condense import condense_jd
+from .extractor import (
+    _posting_from_api,
+    _posting_from_render,
+    _request_headers,
+    _text_from_response,
+    analyze_jd,
+)
+from .fetcher import FetchError, fetcher
+from .hosts import HostUnavailable
+from .pipeline import skills_payload
+from .resolver import UnsafeHost
+
+BATCH_MAX_URLS = 50
+BATCH_CONCURRENCY = int(os.getenv("EXTRACTION_BATCH_CONCURRENCY", "10"))
+BATCH_PER_HOST = int(os.getenv("EXTRACTION_BATCH_PER_HOST", "2"))
+BATCH_ANALYZE_CONCURRENCY = int(os.getenv("EXTRACTION_BATCH_ANALYZE_CONCURRENCY", "4"))
+
+# shared by every batch in the process: renders are the expensive part
+_render_slots = threading.BoundedSemaphore(int(os.getenv("EXTRACTION_RENDER_QUEUE", "2")))
+
+
+class BatchStopped(Exception):
+    """The client went away; the batch is not worth finishing."""
+
+
+def _render_queued(key: str, url: str, stop: threading.Event) -> dict:
+    with _render_slots:
+        # the wait for a slot can be long; the client may be gone by now
+        if stop.is_set():
+            raise BatchStopped()
+        return _posting_from_render(key, url)
+
+
+class _Limits:
+    def __init__(self, stop: threading.Event | None = None):
+        self.fetch = asyncio.Semaphore(BATCH_CONCURRENCY)
+        self.analyze = asyncio.Semaphore(BATCH_ANALYZE_CONCURRENCY)
+        self.stop = stop or threading.Event()
+        self._hosts = {}
+
+    def check(self):
+        if self.stop.is_set():
+            raise BatchStopped()
+
+    def host(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).hostname or ""
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(BATCH_PER_HOST)
+        return self._hosts[host]
+
+
+async def fetch_posting_async(url: str, limits: _Limits) -> dict:
+    """Async counterpart of extractor.extract_posting."""
+    key = canonicalize_url(url)
+    cached, fresh = jd_cache.lookup(key)
+    if fresh:
+        return cached.posting()
+
+    async with limits.fetch, limits.host(url):
+        limits.check()
+        posting = await asyncio.to_thread(_posting_from_api, key, url)
+    if posting:
+        return posting
+
+    try:
+        async with limits.fetch, limits.host(url):
+            limits.check()
+            res = await asyncio.to_thread(fetcher.get, url, _request_headers(cached))
+        text = await asyncio.to_thread(_text_from_response, key, url, res, cached)
+        if text:
+            return {"text": text}
+    except (FetchError, UnsafeHost, HostUnavailable, BatchStopped):
+        raise
+    except Exception as e:
+        print(f"batch fetch failed for {url}: {e}")
+
+    limits.check()
+    return await asyncio.to_thread(_render_queued, key, url, limits.stop)
+
+
+async def _process(index: int, url: str, limits: _Limits, guard, analyze: bool) -> dict:
+    if await asyncio.to_thread(guard, url):
+        return {"index": index, "url": url, "ok": False, "detail": "Invalid or private host"}
+
+    try:
+        posting = await fetch_posting_async(url, limits)
+    except Exception as e:
+        return {"index": index, "url": url, "ok": False, "detail": f"Failed to fetch JD: {e}"}
+
+    text = posting["text"]
+    if not analyze:
+        return {"index": index, "url": url, "ok": True, "text": text, "chars": len(text)}
+
+    condensed = condense_jd(text)
+    try:
+        async with limits.analyze:
+            limits.check()
+            analysis = await asyncio.to_thread(analyze_jd, condensed.text)
+    except Exception as e:
+        return {"index": index, "url": url, "ok": False, "detail": f"Skill analysis failed: {e}"}
+    return {"index": index, "ok": True, **skills_payload(url, condensed, analysis, posting)}
+
+
+async def _cancel_when_stopped(stop: threading.Event, tasks: list):
+    while not stop.is_set():
+        await asyncio.sleep(0.1)
+    for task in tasks:
+        task.cancel()
+
+
+async def run_batch(urls: list, emit, guard, analyze: bool = True, stop=None):
+    """Process ``urls`` concurrently, calling ``emit(result)`` as each one finishes.
+
+    ``guard(url)`` returns True for URLs that must not be fetched. Setting the
+    ``stop`` event cancels the URLs still pending and returns early.
+    """
+    limits = _Limits(stop)
+    tasks = [
+        asyncio.create_task(_process(i, url, limits, guard, analyze)) for i, url in enumerate(urls)
+    ]
+    watcher = asyncio.create_task(_cancel_when_stopped(limits.stop, tasks))
+    try:
+        for done in asyncio.as_completed(tasks):
+            try:
+                result = await done
+            except asyncio.CancelledError:
+                return
+            if limits.stop.is_set():
+                return
+            emit(result)
+    finally:
+        watcher.cancel()
+
+
+def stream_batch(urls: list, guard, analyze: bool = True):
+    """Run a batch on a helper thread and return an iterator of NDJSON lines, one per URL."""
+    # taken now, on the request thread, so renders are charged to the caller's bucket
+    context = contextvars.copy_context()
+    return _stream(context, urls, guard, analyze)
+
+
+def _stream(context, urls: list, guard, analyze: bool):
+    results = queue.Queue()
+    finished = object()
+    stop = threading.Event()
+
+    def worker():
+        try:
+            asyncio.run(run_batch(urls, results.put, guard, analyze, stop))
+        except Exception as e:
+            results.put({"ok": False, "detail": f"Batch failed: {e}"})
+        finally:
+            results.put(finished)
+
+    threading.Thread(
+        target=context.run, args=(worker,), name="extraction-batch", daemon=True
+    ).start()
+    try:
+        while (item := results.get()) is not finished:
+            yield json.dumps(item) + "\n"
+    finally:
+        # also runs when the server closes the response because the client left
+        stop.set()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Long-lived headless Chromium pool for the Playwright fallback.
+
+Playwright objects are bound to the event loop that created them, so the pool
+owns a private asyncio loop running in a daemon thread. Callers on any thread
+hand it a coroutine function that receives a fresh page; the pool checks the
+page out of a warm browser, runs the coroutine on its loop and returns the
+result synchronously.
+
+Browsers connect only through a PinningProxy on the same loop, so every
+connection a render makes goes to an address the resolver validated.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+from .proxy import PinningProxy
+from .resolver import resolver
+
+POOL_SIZE = int(os.getenv("EXTRACTION_BROWSER_POOL_SIZE", "2"))
+MAX_PAGES_PER_BROWSER = int(os.getenv("EXTRACTION_BROWSER_MAX_PAGES", "4"))
+MAX_USES_PER_BROWSER = int(os.getenv("EXTRACTION_BROWSER_MAX_USES", "100"))
+LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+# nothing we extract depends on these, so the fallback never downloads them
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+TRACKER_DOMAINS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "ads.linkedin.com",
+    "onetrust.com",
+    "cookielaw.org",
+    "qualtrics.com",
+}
+
+
+def _is_tracker(url: str) -> bool:
+    labels = (urlparse(url).hostname or "").lower().split(".")
+    return any(".".join(labels[i:]) in TRACKER_DOMAINS for i in range(len(labels) - 1))
+
+
+async def _block_unneeded(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url):
+        await route.abort()
+        return
+    # subresources and redirects must pass the same SSRF check as the page itself;
+    # this fails fast, the connection itself is pinned by the PinningProxy
+    parts = urlparse(request.url)
+    if parts.scheme in ("http", "https"):
+        if not await asyncio.to_thread(resolver.is_safe, parts.hostname):
+            await route.abort("addressunreachable")
+            return
+    await route.continue_()
+
+
+class _Slot:
+    """One warm browser and its bookkeeping."""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.open_pages = 0
+        self.uses = 0
+        self.launched_at = time.monotonic()
+
+    def healthy(self) -> bool:
+        return self.browser.is_connected()
+
+    def exhausted(self, max_uses: int) -> bool:
+        return self.uses >= max_uses
+
+
+class BrowserPool:
+    """Bounded pool of headless Chromium browsers shared across threads."""
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_pages: int = MAX_PAGES_PER_BROWSER,
+        max_uses: int = MAX_USES_PER_BROWSER,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._slots = []
+        self._cond = None  # asyncio.Condition, created on the pool loop
+        self._proxy = None
+        self._proxy_url = None
+
+        self.launches = 0
+        self.recycled = 0
+        self.checkouts = 0
+
+    # ----- thread / loop lifecycle -----
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name="browser-pool", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+    def run(self, fn, timeout: float | None = None):
+        """Run ``await fn(page)`` on a pooled page and return its result."""
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._with_page(fn), self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        """Close every browser and stop the pool thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(10)
+        except Exception as e:
+            print(f"browser pool shutdown failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+    def stats(self) -> dict:
+        return {
+            "browsers": len(self._slots),
+            "open_pages": sum(s.open_pages for s in self._slots),
+            "launches": self.launches,
+            "recycled": self.recycled,
+            "checkouts": self.checkouts,
+            "proxy": self._proxy.stats() if self._proxy is not None else None,
+        }
+
+    # ----- coroutines running on the pool loop -----
+
+    async def _with_page(self, fn):
+        slot = await self._checkout()
+        context = None
+        try:
+            context = await slot.browser.new_context()
+            await context.route("**/*", _block_unneeded)
+            page = await context.new_page()
+            return await fn(page)
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._checkin(slot)
+
+    async def _checkout(self) -> _Slot:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            while True:
+                await self._reap()
+                slot = self._pick_slot()
+                if slot is None and len(self._slots) < self.size:
+                    slot = await self._launch()
+                if slot is not None:
+                    slot.open_pages += 1
+                    slot.uses += 1
+                    self.checkouts += 1
+                    return slot
+                await self._cond.wait()
+
+    async def _checkin(self, slot: _Slot):
+        async with self._cond:
+            slot.open_pages -= 1
+            self._cond.notify_all()
+
+    def _pick_slot(self):
+        candidates = [
+            s
+            for s in self._slots
+            if s.healthy() and not s.exhausted(self.max_uses) and s.open_pages < self.max_pages
+        ]
+        # prefer the least loaded browser
+        return min(candidates, key=lambda s: s.open_pages, default=None)
+
+    async def _reap(self):
+        """Drop crashed browsers and recycle idle ones that hit their use limit."""
+        for slot in list(self._slots):
+            dead = not slot.healthy()
+            if dead or (slot.exhausted(self.max_uses) and slot.open_pages == 0):
+                self._slots.remove(slot)
+                if not dead:
+                    self.recycled += 1
+                try:
+                    await slot.browser.close()
+                except Exception:
+                    pass
+
+    async def _launch(self) -> _Slot:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        if self._proxy is None:
+            self._proxy = PinningProxy()
+            self._proxy_url = await self._proxy.start()
+        browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=LAUNCH_ARGS,
+            # Chromium skips proxies for loopback unless told otherwise
+            proxy={"server": self._proxy_url, "bypass": "<-loopback>"},
+        )
+        slot = _Slot(browser)
+        self._slots.append(slot)
+        self.launches += 1
+        return slot
+
+    async def _close_all(self):
+        for slot in self._slots:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+        self._slots = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._proxy is not None:
+            await self._proxy.close()
+            self._proxy = None
+        self._cond = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
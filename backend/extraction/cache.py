@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+In-process cache for extracted job description text.
+
+Entries are keyed by a canonical form of the posting URL so that the same
+Greenhouse/Lever/Workday link pasted with different tracking params, locale
+segments or trailing slashes shares one entry. Each entry keeps the response
+validators (ETag / Last-Modified) so a stale entry can be revalidated with a
+conditional GET instead of re-extracting the page.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL", str(6 * 60 * 60)))
+CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "512"))
+CACHE_MAX_CHARS = int(os.getenv("EXTRACTION_CACHE_MAX_CHARS", str(32 * 1024 * 1024)))
+
+TRACKING_PARAMS = {
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "referrer",
+    "source",
+    "src",
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "trk",
+    "trackingid",
+    "refid",
+    "_hsenc",
+    "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_", "lever-source[")
+
+# Workday serves the same posting under /en-US/, /fr-FR/, ... path prefixes
+WORKDAY_LOCALE_RE = re.compile(r"^/[a-z]{2}-[A-Z]{2}(?=/)")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a posting URL so equivalent links map to the same cache key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if host.endswith("myworkdayjobs.com"):
+        path = WORKDAY_LOCALE_RE.sub("", path)
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if not _is_tracking_param(k))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class CacheEntry:
+    def __init__(self, text: str, etag: str = "", last_modified: str = "", meta=None):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.meta = meta or {}
+        self.stored_at = time.monotonic()
+
+    def posting(self) -> dict:
+        return {"text": self.text, **self.meta}
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class JDCache:
+    """Thread-safe LRU cache of extracted text with TTL and a size budget."""
+
+    def __init__(
+        self,
+        ttl: int = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_chars: int = CACHE_MAX_CHARS,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def lookup(self, key: str):
+        """Return ``(entry, fresh)``; ``entry`` may be stale and still worth revalidating."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.age() < self.ttl:
+                self.hits += 1
+                return entry, True
+            self.misses += 1
+            return entry, False
+
+    def is_fresh(self, key: str) -> bool:
+        """True if ``key`` would be served without a fetch; does not touch LRU order or stats."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.age() < self.ttl
+
+    def put(self, key: str, text: str, etag: str = "", last_modified: str = "", meta=None):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old.text)
+            self._entries[key] = CacheEntry(text, etag or "", last_modified or "", meta)
+            self._chars += len(text)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._chars > self.max_chars
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.text)
+                self.evictions += 1
+
+    def revalidated(self, key: str):
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+                self.revalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "chars": self._chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+jd_cache = JDCache()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Network capture rules for the Playwright fallback.
+
+SPA job boards fetch the posting as JSON and then paint it into the DOM.
+When a host has a capture rule, the renderer listens to network responses
+and returns as soon as a response matching the rule carries the posting,
+without waiting for the paint or re-parsing the page. Rules are keyed by
+hostname suffix like the site extractors and can be added with
+``register_capture``.
+"""
+
+import re
+from urllib.parse import urlparse
+
+from .ats_api import Posting, html_to_text
+
+
+def _dig(data, path: str):
+    """Follow a dotted path (``a.b.0.c``) into nested dicts/lists; None if absent."""
+    for key in path.split(".") if path else []:
+        if isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+    return data
+
+
+class CaptureRule:
+    """Which response carries the posting, and where its fields live in the JSON.
+
+    ``text_path`` points at the description; ``html`` says whether it is HTML
+    that still needs converting to text.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url_pattern: str,
+        text_path: str,
+        title_path: str = "",
+        company_path: str = "",
+        location_path: str = "",
+        html: bool = True,
+    ):
+        self.name = name
+        self.url_re = re.compile(url_pattern)
+        self.text_path = text_path
+        self.title_path = title_path
+        self.company_path = company_path
+        self.location_path = location_path
+        self.html = html
+
+    def matches(self, url: str) -> bool:
+        return bool(self.url_re.search(url))
+
+    def extract(self, data):
+        """Return a Posting from a matching response body, or None if it lacks one."""
+        raw = _dig(data, self.text_path)
+        if not isinstance(raw, str) or not raw.strip():
+            return None
+        text = html_to_text(raw) if self.html else raw
+
+        def field(path):
+            value = _dig(data, path) if path else None
+            return value if isinstance(value, str) else ""
+
+        return Posting(
+            f"capture:{self.name}",
+            text,
+            title=field(self.title_path),
+            company=field(self.company_path),
+            location=field(self.location_path),
+        )
+
+
+_rules = {}
+
+
+def register_capture(rule: CaptureRule, *suffixes: str):
+    """Capture responses matching ``rule`` on hosts equal to or ending in ``.suffix``."""
+    for suffix in suffixes:
+        _rules[suffix.lower()] = rule
+
+
+def capture_rule_for(url: str):
+    labels = (urlparse(url).hostname or "").lower().split(".")
+    for i in range(len(labels)):
+        rule = _rules.get(".".join(labels[i:]))
+        if rule is not None:
+            return rule
+    return None
+
+
+register_capture(
+    CaptureRule(
+        "workday",
+        r"/wday/cxs/[^/]+/[^/]+/job/",
+        "jobPostingInfo.jobDescription",
+        title_path="jobPostingInfo.title",
+        company_path="hiringOrganization.name",
+        location_path="jobPostingInfo.location",
+    ),
+    "myworkdayjobs.com",
+)
+register_capture(
+    CaptureRule(
+        "ashby",
+        r"/api/non-user-graphql\?op=ApiJobPosting\b",
+        "data.jobPosting.descriptionHtml",
+        title_path="data.jobPosting.title",
+        location_path="data.jobPosting.locationName",
+    ),
+    "ashbyhq.com",
+)
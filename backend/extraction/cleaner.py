@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Text cleanup for extracted job descriptions.
+
+Icon ligature words (case-insensitive, whole words) and boilerplate phrases
+(case-sensitive, any whitespace between words) are compiled into one regex
+so the text is scanned once for all of them, then once more to collapse
+whitespace. A lookahead on the possible first characters lets the regex
+engine skip most positions without trying every alternative.
+"""
+
+import re
+
+from django.conf import settings
+
+DEFAULT_ICON_WORDS = [
+    "expand_more",
+    "expand_less",
+    "person_outline",
+    "location_on",
+    "work",
+    "attach_money",
+    "schedule",
+    "keyboard_arrow_down",
+    "keyboard_arrow_up",
+]
+
+DEFAULT_NOISE_PHRASES = [
+    "Skip to main content",
+    "Sign in",
+    "Sign up",
+    "Apply now",
+    "Save job",
+    "Share job",
+    "Cookie policy",
+    "Privacy policy",
+    "Terms of service",
+    "Terms and conditions",
+]
+
+
+def _phrase_pattern(phrase: str) -> str:
+    return r"\s+".join(re.escape(word) for word in phrase.split())
+
+
+class TextCleaner:
+    """Removes icon words and boilerplate phrases, then normalizes whitespace."""
+
+    def __init__(self, icon_words=None, noise_phrases=None):
+        self.icon_words = list(DEFAULT_ICON_WORDS if icon_words is None else icon_words)
+        self.noise_phrases = list(DEFAULT_NOISE_PHRASES if noise_phrases is None else noise_phrases)
+
+        alternatives = []
+        first_chars = set()
+        icons = [w for w in self.icon_words if w]
+        if icons:
+            # longest first so a word never shadows a longer one sharing its prefix
+            icons.sort(key=len, reverse=True)
+            alternatives.append(r"(?i:\b(?:" + "|".join(map(re.escape, icons)) + r")\b)")
+            first_chars.update(c for w in icons for c in (w[0].lower(), w[0].upper()))
+        phrases = sorted((p for p in self.noise_phrases if p.strip()), key=len, reverse=True)
+        alternatives.extend(_phrase_pattern(p) for p in phrases)
+        first_chars.update(p.lstrip()[0] for p in phrases)
+
+        self._noise = None
+        if alternatives:
+            guard = "[" + "".join(re.escape(c) for c in sorted(first_chars)) + "]"
+            self._noise = re.compile(f"(?={guard})(?:{'|'.join(alternatives)})")
+
+    def clean(self, text: str) -> str:
+        if self._noise is not None:
+            text = self._noise.sub("", text)
+        # split() without arguments collapses any whitespace run and trims the ends
+        return " ".join(text.split())
+
+
+_default = None
+
+
+def get_cleaner() -> TextCleaner:
+    """Cleaner built from EXTRACTION_ICON_WORDS / EXTRACTION_NOISE_PHRASES settings, if set."""
+    global _default
+    if _default is None:
+        icons = phrases = None
+        if settings.configured:
+            icons = getattr(settings, "EXTRACTION_ICON_WORDS", None)
+            phrases = getattr(settings, "EXTRACTION_NOISE_PHRASES", None)
+        _default = TextCleaner(icons, phrases)
+    return _default
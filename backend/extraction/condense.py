@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Condense a job description to a token budget before it is sent to the LLM.
+
+The text is split into sections at common JD headings ("Responsibilities",
+"Qualifications", "Benefits", ...). Each section is scored by what its
+heading says it is and by how many taxonomy skills it mentions, legal
+boilerplate (EEO, privacy, E-Verify) is dropped, and the best sections are
+packed into CONDENSE_TOKEN_BUDGET, sentence by sentence for the one that does
+not fit whole. A sentence too big for what is left, as in scraped bullet
+lists with no punctuation, is cut to fit. Kept text stays in its original
+order, and non-empty input never condenses to nothing.
+
+Tokens are counted with ai.tokens.count_tokens (tiktoken when installed).
+"""
+
+import os
+import re
+import threading
+
+from ai.tokens import count_tokens, truncate_tokens
+
+from .skills import get_skill_matcher
+
+CONDENSE_TOKEN_BUDGET = int(os.getenv("EXTRACTION_CONDENSE_TOKEN_BUDGET", "2500"))
+INTRO_TOKENS = 150  # title, company and location are usually up front
+MIN_CUT_TOKENS = 16  # below this a cut-off sentence is not worth keeping
+
+# heading phrase -> section weight; matched at the start of a sentence
+SECTION_HEADINGS = {
+    3.0: (
+        "responsibilities",
+        "key responsibilities",
+        "your responsibilities",
+        "what you'll do",
+        "what you will do",
+        "what you'll be doing",
+        "what you will be doing",
+        "what you'll work on",
+        "in this role, you will",
+        "your impact",
+        "duties",
+        "requirements",
+        "qualifications",
+        "minimum qualifications",
+        "basic qualifications",
+        "required qualifications",
+        "what you'll bring",
+        "what you bring",
+        "what we're looking for",
+        "what we are looking for",
+        "who you are",
+        "you have",
+        "skills",
+        "required skills",
+        "technical skills",
+        "must have",
+        "must haves",
+    ),
+    2.0: (
+        "preferred qualifications",
+        "preferred skills",
+        "nice to have",
+        "nice to haves",
+        "bonus points",
+        "bonus",
+        "pluses",
+    ),
+    1.5: (
+        "about the role",
+        "about the team",
+        "the role",
+        "the team",
+        "overview",
+        "job description",
+        "position summary",
+        "role summary",
+        "summary",
+    ),
+    0.5: (
+        "about us",
+        "about the company",
+        "who we are",
+        "our mission",
+        "our values",
+        "why join us",
+        "why you'll love working here",
+    ),
+    0.2: (
+        "benefits",
+        "perks",
+        "perks and benefits",
+        "what we offer",
+        "compensation",
+        "salary",
+        "pay range",
+        "pay transparency",
+        "location",
+    ),
+    0.0: (
+        "equal opportunity",
+        "equal employment opportunity",
+        "eeo statement",
+        "accommodations",
+        "reasonable accommodation",
+        "privacy notice",
+        "applicant privacy",
+        "e-verify",
+    ),
+}
+INTRO_WEIGHT = 1.5
+
+_HEADING_WEIGHT = {
+    phrase: weight for weight, phrases in SECTION_HEADINGS.items() for phrase in phrases
+}
+_HEADING_RE = re.compile(
+    r"(?:^|(?<=[.!?:;])\s+|\s+(?=[A-Z]))(?P<heading>"
+    + "|".join(
+        re.escape(p).replace("'", "['’]") for p in sorted(_HEADING_WEIGHT, key=len, reverse=True)
+    )
+    + r")\b\s*:?\s+",
+    re.I,
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_BOILERPLATE_RE = re.compile(
+    r"equal (?:employment )?opportunity|without regard to (?:race|age|sex)|e-verify|"
+    r"reasonable accommodation|protected veteran|applicant privacy|privacy (?:notice|policy)",
+    re.I,
+)
+
+
+class Condensed:
+    """Condensed text and the token counts before and after."""
+
+    def __init__(self, text: str, tokens_in: int, tokens_out: int):
+        self.text = text
+        self.tokens_in = tokens_in
+        self.tokens_out = tokens_out
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+
+class _Section:
+    def __init__(self, index: int, heading: str, body: str, weight: float):
+        self.index = index
+        self.heading = heading
+        self.sentences = [
+            s for s in _SENTENCE_RE.split(body.strip()) if s and not _BOILERPLATE_RE.search(s)
+        ]
+        self.weight = weight
+        self.kept = []
+
+    def text(self, sentences) -> str:
+        return " ".join(([self.heading] if self.heading else []) + list(sentences))
+
+
+def split_sections(text: str) -> list:
+    """Split ``text`` at known headings into ``_Section`` objects, intro first."""
+    sections = []
+    start, heading, weight = 0, "", INTRO_WEIGHT
+    for match in _HEADING_RE.finditer(text):
+        found = match.group("heading")
+        # headings are written capitalised; lower-case hits are running prose
+        if not found[0].isupper():
+            continue
+        sections.append(_Section(len(sections), heading, text[start : match.start()], weight))
+        heading = found
+        weight = _HEADING_WEIGHT[found.lower().replace("’", "'")]
+        start = match.end()
+    sections.append(_Section(len(sections), heading, text[start:], weight))
+    return [s for s in sections if s.sentences or s.heading]
+
+
+def _skill_bonus(section: _Section, tokens: int) -> float:
+    matches = len(get_skill_matcher().find(section.text(section.sentences)))
+    return min(1.0, 20 * matches / max(tokens, 1))
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.condensed = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def record(self, result: Condensed):
+        with self._lock:
+            self.requests += 1
+            self.condensed += result.tokens_saved > 0
+            self.tokens_in += result.tokens_in
+            self.tokens_out += result.tokens_out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "condensed": self.condensed,
+                "tokens_in": self.tokens_in,
+                "tokens_out": self.tokens_out,
+                "tokens_saved": self.tokens_in - self.tokens_out,
+            }
+
+
+condense_stats = _Stats()
+
+
+def condense_jd(text: str, budget: int = CONDENSE_TOKEN_BUDGET) -> Condensed:
+    """Return the most relevant parts of ``text`` that fit in ``budget`` tokens."""
+    tokens_in = count_tokens(text)
+    if tokens_in <= budget:
+        result = Condensed(text, tokens_in, tokens_in)
+        condense_stats.record(result)
+        return result
+
+    sections = split_sections(text)
+    costs = {}
+    for section in sections:
+        for sentence in section.sentences:
+            costs[sentence] = costs.get(sentence) or count_tokens(sentence) + 1
+    ranked = sorted(
+        (s for s in sections if s.weight > 0),
+        key=lambda s: (
+            -(s.weight + _skill_bonus(s, sum(costs[x] for x in s.sentences))),
+            s.index,
+        ),
+    )
+
+    remaining = budget
+    seen = set()  # pages often repeat blocks; a sentence is kept once
+    intro = sections[0] if sections and not sections[0].heading else None
+    if intro is not None:
+        # keep the opening regardless of rank so the title/company survive
+        for sentence in intro.sentences:
+            if costs[sentence] > min(remaining, INTRO_TOKENS - (budget - remaining)):
+                break
+            intro.kept.append(sentence)
+            seen.add(sentence)
+            remaining -= costs[sentence]
+
+    for section in ranked:
+        # the intro comes round again to add what did not fit its allowance
+        heading_cost = count_tokens(section.heading) + 1 if section.heading else 0
+        if remaining <= heading_cost:
+            continue
+        kept = []
+        left = remaining - heading_cost
+        for sentence in section.sentences:
+            if sentence in seen:
+                continue
+            if costs[sentence] <= left:
+                seen.add(sentence)
+                kept.append(sentence)
+                left -= costs[sentence]
+            elif left >= MIN_CUT_TOKENS:
+                cut = truncate_tokens(sentence, left - 1)
+                seen.add(sentence)
+                kept.append(cut)
+                left -= count_tokens(cut) + 1
+                break
+        if kept:
+            section.kept += kept
+            remaining = left
+
+    out = " ".join(s.text(s.kept) for s in sections if s.kept)
+    if not out and text.strip():
+        out = truncate_tokens(text, budget)
+    result = Condensed(out, tokens_in, count_tokens(out))
+    condense_stats.record(result)
+    return result
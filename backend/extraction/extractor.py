@@ -6,14 +6,32 @@ Enhanced extractor.py
 Supports: iCIMS, Workday, Greenhouse, Ashby, Lever, SmartRecruiters, BambooHR, etc.
 """
 
+import asyncio
+import contextlib
 import json
-import os
-
-import requests
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-from openai import OpenAI
-from playwright.sync_api import sync_playwright
+import time
+from urllib.parse import urlparse
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from ai.gateway import get_gateway
+from leetcode.recommender import recommend_problems
+from throttling.buckets import COST_RENDER, record_cost
+
+from .ats_api import fetch_posting
+from .browser import get_browser_pool
+from .cache import canonicalize_url, jd_cache
+from .capture import capture_rule_for
+from .cleaner import get_cleaner
+from .condense import CONDENSE_TOKEN_BUDGET, condense_jd, count_tokens
+from .fetcher import FetchError, fetcher
+from .hosts import HostUnavailable, host_limiter
+from .jsonstream import JsonFieldStream
+from .llm_cache import analysis_cache, analysis_key, prompt_version
+from .readability import extract_main_text
+from .resolver import UnsafeHost
+from .sites import extractor_for
+from .skills import extract_skills
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -24,159 +42,175 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+# hard cap on waiting for dynamic content after the DOM is loaded
+RENDER_READY_TIMEOUT_MS = 8000
+
 
 def _extract_from_html(html: str, url: str) -> str:
     """Extract job description text from HTML for common ATS platforms."""
-    soup = BeautifulSoup(html, "lxml")
-    domain = url.lower()
-
-    # Remove unwanted elements
-    for tag in soup.find_all(["script", "style", "nav", "header", "footer", "button", "aside"]):
-        tag.decompose()
-
-    # Remove elements with common noise classes/ids
-    noise_selectors = [
-        {"class": "navigation"},
-        {"class": "nav"},
-        {"class": "menu"},
-        {"class": "footer"},
-        {"class": "header"},
-        {"class": "sidebar"},
-        {"id": "header"},
-        {"id": "footer"},
-        {"id": "navigation"},
-    ]
-    for selector in noise_selectors:
-        for element in soup.find_all(attrs=selector):
-            element.decompose()
-
-    # iCIMS
-    if "icims.com" in domain:
-        job_content = soup.find("div", id="jobcontent")
-        if job_content:
-            return _clean_text(job_content.get_text(" ", strip=True))
-
-    # Workday
-    if "myworkdayjobs.com" in domain:
-        selectors = [
-            {"data-automation-id": "jobPostingDescription"},
-            {"data-automation-id": "richTextArea"},
-            {"role": "text"},
-        ]
-        for c in selectors:
-            wd_div = soup.find("div", c)
-            if wd_div:
-                return _clean_text(wd_div.get_text(" ", strip=True))
-        wd_section = soup.find("section")
-        if wd_section:
-            return _clean_text(wd_section.get_text(" ", strip=True))
-
-    # Greenhouse
-    if "greenhouse.io" in domain:
-        gh_div = soup.find("div", class_="job")
-        if gh_div:
-            return _clean_text(gh_div.get_text(" ", strip=True))
-
-    # Ashby
-    if "ashbyhq.com" in domain:
-        ashby_div = soup.find("div", {"data-testid": "JobDescription"})
-        if ashby_div:
-            return _clean_text(ashby_div.get_text(" ", strip=True))
-
-    # Lever
-    if "lever.co" in domain:
-        lever_div = soup.find("div", class_="posting")
-        if lever_div:
-            return _clean_text(lever_div.get_text(" ", strip=True))
-
-    # SmartRecruiters
-    if "smartrecruiters.com" in domain:
-        sr_div = soup.find("div", class_="job-sections")
-        if sr_div:
-            return _clean_text(sr_div.get_text(" ", strip=True))
-
-    # BambooHR
-    if "bamboohr.com" in domain:
-        bh_div = soup.find("div", id="content")
-        if bh_div:
-            return _clean_text(bh_div.get_text(" ", strip=True))
-
-    # Fallback: try to find main content areas
-    main_content = soup.find("main") or soup.find("article") or soup.find("div", role="main")
-    if main_content:
-        return _clean_text(main_content.get_text(" ", strip=True))
-
-    body_text = soup.get_text(" ", strip=True)
-    if body_text:
-        return _clean_text(body_text)
-
-    return ""
+    site = extractor_for(url)
+    if site is not None:
+        text = site.extract(html)
+        if text:
+            return _clean_text(text)
+    return _extract_generic(html)
+
+
+def _extract_generic(html: str) -> str:
+    """Fallback for unknown sites: the highest scoring content block."""
+    return _clean_text(extract_main_text(html))
 
 
 def _clean_text(text: str) -> str:
     """Clean extracted text by removing common noise patterns."""
-    import re
-
-    # Remove Material Icons text patterns
-    text = re.sub(
-        r"\b(expand_more|expand_less|person_outline|location_on|work|attach_money|schedule|keyboard_arrow_down|keyboard_arrow_up)\b",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
+    return get_cleaner().clean(text)
 
-    # Remove excessive whitespace
-    text = re.sub(r"\s+", " ", text)
 
-    # Remove button/link noise
-    common_noise = [
-        "Skip to main content",
-        "Sign in",
-        "Sign up",
-        "Apply now",
-        "Save job",
-        "Share job",
-        "Cookie policy",
-        "Privacy policy",
-        "Terms of service",
-        "Terms and conditions",
-    ]
-    for noise in common_noise:
-        text = text.replace(noise, "")
+def _render_page(url: str):
+    """Render a page on a pooled headless Chromium.
 
-    return text.strip()
+    Returns ``(html, posting)``. If the host has a capture rule and the posting
+    JSON is seen on the network, rendering stops there and ``posting`` is set
+    instead of ``html``. Otherwise waits for the ATS's posting container when
+    the host is known, or for the network to go idle, but never longer than
+    RENDER_READY_TIMEOUT_MS, and returns the final HTML.
+    """
+    site = extractor_for(url)
+    ready_selector = site.ready_selector if site is not None else ""
+    rule = capture_rule_for(url)
+
+    async def render(page):
+        captured = asyncio.get_running_loop().create_future()
+
+        async def on_response(response):
+            if captured.done() or not rule.matches(response.url):
+                return
+            try:
+                posting = rule.extract(await response.json())
+            except Exception:
+                return
+            if posting is not None and not captured.done():
+                captured.set_result(posting)
+
+        if rule is not None:
+            page.on("response", on_response)
+
+        async def load():
+            await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+            try:
+                if ready_selector:
+                    await page.wait_for_selector(
+                        ready_selector, state="attached", timeout=RENDER_READY_TIMEOUT_MS
+                    )
+                else:
+                    await page.wait_for_load_state("networkidle", timeout=RENDER_READY_TIMEOUT_MS)
+            except PlaywrightTimeoutError:
+                print("Render readiness timed out, using the page as is")
+
+        loading = asyncio.ensure_future(load())
+        await asyncio.wait({loading, captured}, return_when=asyncio.FIRST_COMPLETED)
+        if captured.done():
+            loading.cancel()
+            with contextlib.suppress(BaseException):
+                await loading
+            return None, captured.result()
+        loading.result()  # re-raise navigation errors
+        return await page.content(), None
+
+    return get_browser_pool().run(render, timeout=60)
+
+
+def _text_from_response(key: str, url: str, res, cached) -> str | None:
+    """Turn a fetch response into JD text and cache it; None means render instead."""
+    if res.status_code == 304 and cached is not None:
+        jd_cache.revalidated(key)
+        print("Revalidated cached text")
+        return cached.text
+    text = _extract_from_html(res.text, url)
+    if text and len(text) > 200:
+        jd_cache.put(
+            key,
+            text,
+            etag=res.headers.get("ETag"),
+            last_modified=res.headers.get("Last-Modified"),
+        )
+        return text
+    return None
 
 
-def extract_jd_text(url: str) -> str:
+def _posting_from_render(key: str, url: str) -> dict:
+    record_cost(COST_RENDER)
+    with host_limiter.slot(urlparse(url).hostname):
+        html, posting = _render_page(url)
+    # rendered results have no validators of their own, so they only live for the TTL
+    if posting is not None:
+        print("Captured posting JSON while rendering")
+        jd_cache.put(key, posting.text, meta=posting.meta())
+        return {"text": posting.text, **posting.meta()}
+
+    text = _extract_from_html(html, url)
+    if not text:
+        raise RuntimeError("Failed to extract job description after Playwright rendering: " + url)
+    jd_cache.put(key, text)
+    return {"text": text}
+
+
+def _request_headers(cached) -> dict:
+    headers = dict(DEFAULT_HEADERS)
+    if cached is not None:
+        headers.update(cached.conditional_headers())
+    return headers
+
+
+def _posting_from_api(key: str, url: str) -> dict | None:
+    """Read the posting from its ATS JSON API, if the URL has a fast path."""
+    posting = fetch_posting(url)
+    if posting is None or len(posting.text) <= 200:
+        return None
+    jd_cache.put(key, posting.text, meta=posting.meta())
+    return {"text": posting.text, **posting.meta()}
+
+
+def extract_posting(url: str) -> dict:
+    """Return ``{"text": ...}`` plus job_title/company/location when the source provides them."""
+    key = canonicalize_url(url)
+    cached, fresh = jd_cache.lookup(key)
+    if fresh:
+        print("Extracted via cache")
+        return cached.posting()
+
+    posting = _posting_from_api(key, url)
+    if posting:
+        print("Extracted via ATS API")
+        return posting
+
     try:
-        res = requests.get(url, timeout=15, headers=DEFAULT_HEADERS, allow_redirects=True)
-        text = _extract_from_html(res.text, url)
-        if text and len(text) > 200:
+        res = fetcher.get(url, headers=_request_headers(cached))
+        text = _text_from_response(key, url, res, cached)
+        if text:
             print("Extracted via requests")
-            return text
+            return {"text": text}
+    except (FetchError, UnsafeHost, HostUnavailable):
+        # a PDF, an oversized page, a private host or a failing host will not render any better
+        raise
     except Exception as e:
         print(f"requests failed: {e}")
 
     # Fallback: Playwright
     print("Falling back to Playwright rendering...")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(url, timeout=30000)
-        page.wait_for_timeout(5000)  # wait 5s for dynamic content
-        html = page.content()
-        browser.close()
+    posting = _posting_from_render(key, url)
+    print("Extracted via Playwright")
+    return posting
 
-    text = _extract_from_html(html, url)
-    if not text:
-        raise RuntimeError("Failed to extract job description after Playwright rendering: " + url)
 
-    print("Extracted via Playwright")
-    return text
+def extract_jd_text(url: str) -> str:
+    return extract_posting(url)["text"]
 
 
-def analyze_jd(jd_text: str) -> dict:
-    prompt = f"""
+ANALYZE_MODEL = "gpt-4o-mini"
+ANALYZE_TEMPERATURE = 0.2
+
+ANALYZE_JD_PROMPT = """
     You are a recruiting assistant. Analyze this job description and extract structured information.
 
     Return VALID JSON with this exact schema:
@@ -194,34 +228,6 @@ def analyze_jd(jd_text: str) -> dict:
         "5+ years of experience in software development",
         "Strong proficiency in Python and Java",
         "Experience with cloud platforms (AWS/GCP)"
-      ],
-      "categories": [
-        {{"name": "Languages", "skills": ["Python","Java"]}},
-        {{"name": "Cloud", "skills": ["AWS","GCP"]}}
-      ],
-      "flat": ["Python","Java","AWS","GCP"],
-      "leetcode_recommendations": [
-        {{
-          "problem_name": "Two Sum",
-          "problem_number": 1,
-          "difficulty": "Easy",
-          "reason": "Tests understanding of hash maps and array traversal, fundamental for backend engineering",
-          "url": "https://leetcode.com/problems/two-sum/"
-        }},
-        {{
-          "problem_name": "Design HashMap",
-          "problem_number": 706,
-          "difficulty": "Easy",
-          "reason": "Relevant for understanding data structure design in system development",
-          "url": "https://leetcode.com/problems/design-hashmap/"
-        }},
-        {{
-          "problem_name": "LRU Cache",
-          "problem_number": 146,
-          "difficulty": "Medium",
-          "reason": "Essential for backend caching mechanisms and performance optimization",
-          "url": "https://leetcode.com/problems/lru-cache/"
-        }}
       ]
     }}
 
@@ -229,56 +235,103 @@ def analyze_jd(jd_text: str) -> dict:
     - Extract job_title, company, and location from the text. If not found, use "Not specified".
     - Extract 3-5 key responsibilities as bullet points. Each should be concise (one line), specific, and actionable.
     - Extract 3-5 key requirements as bullet points. Each should be concise (one line), specific, and measurable when possible.
-    - Extract only explicitly mentioned technical skills (languages, frameworks, tools, platforms, cloud, databases, etc.).
-    - Do NOT include vague phrases like "strong communication" in skills.
-    - Prefer specific names: "Python", "React", "AWS Lambda", "Docker".
-    - Classify skills under categories: Languages, Frameworks, Web, Mobile, Cloud, Databases, DevOps, Data/AI, Testing, Security, Hardware/Embedded, Design/UX, Tools, CRM/ERP, Domain/Compliance.
-    - Each category should have at most 9 items.
     - Focus on the most important and role-defining information.
-
-    LeetCode Recommendations Rules:
-    - Recommend EXACTLY 3 LeetCode problems that are most relevant to this specific job role.
-    - Choose problems based on the technical skills, requirements, and responsibilities mentioned in the JD.
-    - Mix difficulty levels appropriately (e.g., 1 Easy, 1 Medium, 1 Hard or 2 Medium, 1 Hard depending on seniority).
-    - For each problem, provide:
-      * problem_name: The exact LeetCode problem title
-      * problem_number: The LeetCode problem number
-      * difficulty: "Easy", "Medium", or "Hard"
-      * reason: A brief explanation (one sentence) of why this problem is relevant to the job
-      * url: The full LeetCode problem URL in format https://leetcode.com/problems/problem-slug/
-    - Examples of relevant mappings:
-      * Backend/API roles: System Design, Database, Caching problems
-      * Frontend roles: DOM manipulation, React patterns, State management
-      * Data Engineer: Array processing, Graph traversal, Dynamic Programming
-      * ML Engineer: Matrix operations, Optimization, Statistical algorithms
-      * Full Stack: Mix of frontend and backend relevant problems
-
     - Output VALID JSON only.
 
     Job Description:
-    {jd_text[:15000]}
+    {jd_text}
     """
+# editing the prompt above changes the version, which invalidates cached analyses
+ANALYZE_JD_PROMPT_VERSION = prompt_version(ANALYZE_JD_PROMPT)
+
 
-    load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("Please set OPENAI_API_KEY in .env")
+def local_analysis(jd_text: str, job_title: str = "") -> dict:
+    """Analysis fields computed without the LLM: taxonomy skills and catalog LeetCode picks."""
+    skills = extract_skills(jd_text)
+    return {
+        **skills,
+        "leetcode_recommendations": recommend_problems(skills["categories"], job_title),
+    }
 
-    client = OpenAI(api_key=api_key)
+
+def _analysis_input(jd_text: str) -> tuple:
+    if count_tokens(jd_text) > CONDENSE_TOKEN_BUDGET:
+        jd_text = condense_jd(jd_text).text
+    key = analysis_key(jd_text, ANALYZE_JD_PROMPT_VERSION, ANALYZE_MODEL, ANALYZE_TEMPERATURE)
+    return jd_text, key
+
+
+def analyze_jd(jd_text: str) -> dict:
+    jd_text, key = _analysis_input(jd_text)
+    # the LLM only writes the free-text fields; the rest is computed locally
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        print("Analysis served from cache")
+        return {**cached, **local_analysis(jd_text, cached.get("job_title", ""))}
+
+    messages = [{"role": "user", "content": ANALYZE_JD_PROMPT.format(jd_text=jd_text)}]
+    gateway = get_gateway()
 
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            response_format={"type": "json_object"},
+        started = time.monotonic()
+        resp = gateway.complete(
+            messages,
+            ANALYZE_MODEL,
+            caller="analyze_jd",
+            temperature=ANALYZE_TEMPERATURE,
+            json=True,
         )
-        raw = resp.choices[0].message.content.strip()
-        return json.loads(raw)
+        result = json.loads(resp.text.strip())
+
+    except Exception as e:
+        print("JSON parse failed:", e)
+        return {"error": "LLM response parsing failed", **local_analysis(jd_text)}
+
+    analysis_cache.put(
+        key, result, ANALYZE_JD_PROMPT_VERSION, ANALYZE_MODEL, time.monotonic() - started
+    )
+    return {**result, **local_analysis(jd_text, result.get("job_title", ""))}
+
+
+def analyze_jd_stream(jd_text: str):
+    """Like analyze_jd, but a generator over the LLM's fields as they are parsed.
+
+    Yields ``(field, value)`` for each top-level field of the completion as
+    soon as it is complete, and returns the same dict analyze_jd would.
+    """
+    jd_text, key = _analysis_input(jd_text)
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        print("Analysis served from cache")
+        yield from cached.items()
+        return {**cached, **local_analysis(jd_text, cached.get("job_title", ""))}
+
+    messages = [{"role": "user", "content": ANALYZE_JD_PROMPT.format(jd_text=jd_text)}]
+    gateway = get_gateway()
+
+    try:
+        started = time.monotonic()
+        fields = JsonFieldStream()
+        raw = ""
+        for delta in gateway.stream(
+            messages,
+            ANALYZE_MODEL,
+            caller="analyze_jd",
+            temperature=ANALYZE_TEMPERATURE,
+            json=True,
+        ):
+            raw += delta
+            yield from fields.feed(delta)
+        result = json.loads(raw)
 
     except Exception as e:
         print("JSON parse failed:", e)
-        return {"error": "LLM response parsing failed"}
+        return {"error": "LLM response parsing failed", **local_analysis(jd_text)}
+
+    analysis_cache.put(
+        key, result, ANALYZE_JD_PROMPT_VERSION, ANALYZE_MODEL, time.monotonic() - started
+    )
+    return {**result, **local_analysis(jd_text, result.get("job_title", ""))}
 
 
 # ----------- Test -----------
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Pooled HTTP fetching for job posting pages and ATS APIs.
+
+Each host gets its own ``requests.Session`` so keep-alive connections are
+reused across extractions. Transient failures (429 and 5xx) are retried with
+jittered exponential backoff, honouring Retry-After. Bodies are streamed in
+under a hard byte cap, and responses whose Content-Type cannot hold a job
+description (PDFs, images, archives) are dropped before the body is read.
+
+Connections are opened to the address the shared resolver already validated,
+so a fetch never does its own DNS lookup.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+
+from .hosts import host_limiter
+from .resolver import resolver
+
+CONNECT_TIMEOUT = float(os.getenv("EXTRACTION_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("EXTRACTION_READ_TIMEOUT", "10"))
+MAX_BODY_BYTES = int(os.getenv("EXTRACTION_MAX_BODY_BYTES", str(5 * 1024 * 1024)))
+FETCH_RETRIES = int(os.getenv("EXTRACTION_FETCH_RETRIES", "2"))
+POOL_MAXSIZE = int(os.getenv("EXTRACTION_POOL_MAXSIZE", "8"))
+MAX_HOSTS = int(os.getenv("EXTRACTION_POOL_MAX_HOSTS", "64"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+JSON_CONTENT_TYPES = ("application/json",)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FetchError(Exception):
+    """The response was refused before or while reading its body."""
+
+
+class FetchResult:
+    """Status, headers and a fully read (capped) body."""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        # unlike requests, don't assume ISO-8859-1 when the charset is missing
+        declared = "charset" in self.headers.get("Content-Type", "").lower()
+        encoding = get_encoding_from_headers(self.headers) if declared else "utf-8"
+        return self.content.decode(encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def content_type_allowed(headers, content_types) -> bool:
+    """True if the response may carry one of ``content_types``; a missing header is allowed."""
+    value = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    return not value or value in content_types
+
+
+def check_length(headers):
+    """Refuse up front when Content-Length already exceeds the cap."""
+    length = headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > MAX_BODY_BYTES:
+        raise FetchError(f"response too large ({length} bytes)")
+
+
+class _PinnedConnectionMixin:
+    """Connect to a resolver-validated address; SNI and Host still use the name.
+
+    Addresses are tried in order, as socket.create_connection would, so an
+    unreachable first record (IPv6 in a v4-only container) is skipped.
+    """
+
+    def _new_conn(self):
+        name = self._dns_host
+        addresses = resolver.resolve(name)
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = name
+
+
+class _PinnedHTTPConnection(_PinnedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _PinnedHTTPSConnection(_PinnedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _PinnedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _PinnedHTTPConnection
+
+
+class _PinnedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _PinnedHTTPSConnection
+
+
+class _PinnedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PinnedHTTPPool,
+            "https": _PinnedHTTPSPool,
+        }
+
+
+class Fetcher:
+    """Per-host pooled sessions with retries, timeouts and a body size cap."""
+
+    def __init__(
+        self,
+        retries: int = FETCH_RETRIES,
+        pool_maxsize: int = POOL_MAXSIZE,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        max_hosts: int = MAX_HOSTS,
+    ):
+        self.retries = retries
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.max_hosts = max_hosts
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _retry(self) -> Retry:
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=0.3,
+            backoff_jitter=0.3,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods={"GET", "HEAD"},
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def session(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is not None:
+                self._sessions.move_to_end(host)
+            else:
+                session = requests.Session()
+                adapter = _PinnedAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=self._retry(),
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                # least recently used hosts give their idle connections back
+                while len(self._sessions) > self.max_hosts:
+                    _, evicted = self._sessions.popitem(last=False)
+                    evicted.close()
+            return session
+
+    def get(self, url: str, headers=None, content_types=HTML_CONTENT_TYPES) -> FetchResult:
+        """GET ``url`` and read at most MAX_BODY_BYTES of it.
+
+        Raises FetchError for a disallowed Content-Type or an oversized body
+        and HostUnavailable while the host's breaker is open; other statuses
+        are returned as is for the caller to judge.
+        """
+        host = (urlparse(url).hostname or "").lower()
+        with (
+            host_limiter.slot(host) as call,
+            self.session(host).get(
+                url, headers=headers, timeout=self.timeout, stream=True, allow_redirects=True
+            ) as res,
+        ):
+            if res.status_code in RETRY_STATUSES:
+                call.fail()
+            else:
+                call.ok()
+            if 200 <= res.status_code < 300:
+                if not content_type_allowed(res.headers, content_types):
+                    raise FetchError(f"unsupported content type {res.headers['Content-Type']}")
+                check_length(res.headers)
+            body = bytearray()
+            for chunk in res.iter_content(CHUNK_SIZE):
+                body += chunk
+                if len(body) > MAX_BODY_BYTES:
+                    raise FetchError(f"response exceeded {MAX_BODY_BYTES} bytes")
+            return FetchResult(res.url, res.status_code, res.headers, bytes(body))
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+fetcher = Fetcher()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Per-host politeness and circuit breaking for outbound extraction traffic.
+
+Every fetch and render against a host takes one of its concurrency slots and
+is spaced at least HOST_MIN_INTERVAL seconds after the previous one. After
+BREAKER_THRESHOLD consecutive failures the host's breaker opens and calls
+fail fast with HostUnavailable for BREAKER_COOLDOWN seconds; then a single
+probe is let through, and its outcome closes or re-opens the breaker.
+
+Only what says the host is unhealthy counts as a failure: connect errors,
+timeouts, and 5xx/429 responses the caller reports with fail(). Refusals of
+our own (an unsafe redirect, a PDF, an oversized page) leave the breaker as
+it was.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import requests
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+HOST_CONCURRENCY = int(os.getenv("EXTRACTION_HOST_CONCURRENCY", "4"))
+HOST_MIN_INTERVAL = float(os.getenv("EXTRACTION_HOST_MIN_INTERVAL", "0.25"))
+HOST_QUEUE_TIMEOUT = float(os.getenv("EXTRACTION_HOST_QUEUE_TIMEOUT", "30"))
+BREAKER_THRESHOLD = int(os.getenv("EXTRACTION_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("EXTRACTION_BREAKER_COOLDOWN", "60"))
+MAX_TRACKED_HOSTS = 256
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class HostUnavailable(Exception):
+    """The host's breaker is open or all of its slots stayed busy."""
+
+
+# Chromium network errors that mean the origin could not be reached
+BROWSER_CONNECT_ERRORS = (
+    "net::ERR_CONNECTION_",
+    "net::ERR_TIMED_OUT",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_TUNNEL_CONNECTION_FAILED",
+)
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """True if ``error`` says the host is unreachable or too slow."""
+    if isinstance(
+        error,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            ConnectionError,
+            TimeoutError,
+            PlaywrightTimeoutError,
+        ),
+    ):
+        return True
+    return isinstance(error, PlaywrightError) and any(
+        marker in str(error) for marker in BROWSER_CONNECT_ERRORS
+    )
+
+
+class _HostState:
+    def __init__(self, concurrency: int):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.next_start = 0.0
+        self.consecutive_failures = 0
+        self.in_flight = 0
+
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+
+
+class _Call:
+    """Outcome of one call; an unreported call that raised is judged by is_host_failure."""
+
+    def __init__(self):
+        self.outcome = None
+
+    def ok(self):
+        self.outcome = True
+
+    def fail(self):
+        self.outcome = False
+
+
+class HostLimiter:
+    def __init__(
+        self,
+        concurrency: int = HOST_CONCURRENCY,
+        min_interval: float = HOST_MIN_INTERVAL,
+        queue_timeout: float = HOST_QUEUE_TIMEOUT,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.queue_timeout = queue_timeout
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.concurrency)
+            # forget the least recently used hosts that are idle and healthy
+            for name in list(self._hosts):
+                if len(self._hosts) <= MAX_TRACKED_HOSTS:
+                    break
+                old = self._hosts[name]
+                if old.in_flight == 0 and old.state == CLOSED:
+                    del self._hosts[name]
+        self._hosts.move_to_end(host)
+        return state
+
+    def _admit(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._state(host)
+            if state.state == OPEN:
+                if time.monotonic() - state.opened_at < self.cooldown:
+                    state.rejected += 1
+                    raise HostUnavailable(f"{host} is failing, retry later")
+                state.state = HALF_OPEN
+            if state.state == HALF_OPEN:
+                if state.probing:
+                    state.rejected += 1
+                    raise HostUnavailable(f"{host} is failing, retry later")
+                state.probing = True
+            state.in_flight += 1
+            state.requests += 1
+            return state
+
+    def _record(self, state: _HostState, ok):
+        """Record a call's outcome; ``ok=None`` says nothing about the host."""
+        with self._lock:
+            state.in_flight -= 1
+            if state.state == HALF_OPEN:
+                state.probing = False
+            if ok is None:
+                return
+            if ok:
+                state.consecutive_failures = 0
+                state.state = CLOSED
+                return
+            state.failures += 1
+            state.consecutive_failures += 1
+            if state.state == HALF_OPEN or state.consecutive_failures >= self.threshold:
+                if state.state != OPEN:
+                    state.trips += 1
+                state.state = OPEN
+                state.opened_at = time.monotonic()
+
+    def _wait_turn(self, state: _HostState):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, state.next_start)
+            state.next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    @contextmanager
+    def slot(self, host: str):
+        """Run one call against ``host``; yields a handle to report ok()/fail().
+
+        Raises HostUnavailable instead of calling when the breaker is open or
+        no slot frees up within the queue timeout.
+        """
+        host = (host or "").lower()
+        state = self._admit(host)
+        if not state.slots.acquire(timeout=self.queue_timeout):
+            # a timed-out wait says nothing about the host's health
+            with self._lock:
+                state.in_flight -= 1
+                state.rejected += 1
+                if state.state == HALF_OPEN:
+                    state.probing = False
+            raise HostUnavailable(f"{host} is busy, retry later")
+
+        call = _Call()
+        try:
+            self._wait_turn(state)
+            yield call
+        except BaseException as e:
+            if call.outcome is not None:
+                self._record(state, ok=call.outcome)
+            else:
+                self._record(state, ok=False if is_host_failure(e) else None)
+            raise
+        else:
+            self._record(state, ok=call.outcome is not False)
+        finally:
+            state.slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    "state": s.state,
+                    "consecutive_failures": s.consecutive_failures,
+                    "in_flight": s.in_flight,
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "rejected": s.rejected,
+                    "trips": s.trips,
+                    "retry_in": (
+                        round(max(0.0, self.cooldown - (now - s.opened_at)), 1)
+                        if s.state == OPEN
+                        else 0.0
+                    ),
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+host_limiter = HostLimiter()
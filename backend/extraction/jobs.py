@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Background execution of extract_skills.
+
+Jobs are rows in ExtractionJob and run on a bounded thread pool, so a slow
+fetch -> render -> LLM chain no longer pins a WSGI worker. A running job
+touches its row at every stage, so one left untouched for STALE_RUNNING_AFTER
+belonged to a worker that died. Such jobs are requeued by a sweep that runs
+when a process serves its first request (see ExtractionConfig.ready), which
+also picks up jobs left queued by a restart, and again at most every
+SWEEP_INTERVAL seconds while jobs are polled, so a job orphaned just before
+a restart is still picked up. Management commands never resume jobs.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.signals import request_started
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+from throttling.buckets import charging, user_key
+
+from .cache import canonicalize_url
+from .models import ExtractionJob
+from .pipeline import PipelineError, run_skills_pipeline
+from .singleflight import flights
+
+JOB_WORKERS = int(os.getenv("EXTRACTION_JOB_WORKERS", "4"))
+# a "running" job untouched for this long belonged to a worker that died
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+SWEEP_INTERVAL = 60  # seconds between sweeps triggered by polling
+RESUME_DISPATCH_UID = "extraction.jobs.resume"
+
+STAGE_PROGRESS = {
+    "queued": 0,
+    "fetching": 10,
+    "analyzing": 50,
+    "done": 100,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_last_sweep = None
+_sweep_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=JOB_WORKERS, thread_name_prefix="extraction-job"
+            )
+        return _executor
+
+
+def _resume_orphaned(executor: ThreadPoolExecutor, startup: bool):
+    stale = timezone.now() - STALE_RUNNING_AFTER
+    dead = list(
+        ExtractionJob.objects.filter(
+            status=ExtractionJob.Status.RUNNING, updated_at__lt=stale
+        ).values_list("id", flat=True)
+    )
+    if dead:
+        ExtractionJob.objects.filter(
+            pk__in=dead, status=ExtractionJob.Status.RUNNING, updated_at__lt=stale
+        ).update(
+            status=ExtractionJob.Status.QUEUED,
+            stage="queued",
+            progress=0,
+            updated_at=timezone.now(),
+        )
+    queued = ExtractionJob.objects.filter(status=ExtractionJob.Status.QUEUED)
+    if not startup:
+        # recent queued jobs are still waiting in some live process's pool
+        queued = queued.filter(updated_at__lt=stale) | queued.filter(pk__in=dead)
+    # submitting a job twice is harmless: only one worker can claim it
+    for job_id in queued.values_list("id", flat=True):
+        executor.submit(_run_job, job_id)
+
+
+def sweep_stale_jobs(startup: bool = False) -> bool:
+    """Requeue and schedule orphaned jobs, at most once per SWEEP_INTERVAL.
+
+    Returns False if the sweep could not run (e.g. migrations not applied yet).
+    """
+    global _last_sweep
+    with _sweep_lock:
+        now = time.monotonic()
+        if not startup and _last_sweep is not None and now - _last_sweep < SWEEP_INTERVAL:
+            return True
+        _last_sweep = now
+    try:
+        _resume_orphaned(_get_executor(), startup)
+        return True
+    except DatabaseError as e:
+        print(f"Could not resume extraction jobs: {e}")
+        with _sweep_lock:
+            _last_sweep = None
+        return False
+
+
+def resume_on_request(**kwargs):
+    """request_started receiver: resume orphaned jobs once per process."""
+    if sweep_stale_jobs(startup=True):
+        request_started.disconnect(dispatch_uid=RESUME_DISPATCH_UID)
+
+
+def submit_job(user, url: str) -> ExtractionJob:
+    """Persist a new job and schedule it once the row is committed."""
+    job = ExtractionJob.objects.create(user=user, url=url, stage="queued")
+    executor = _get_executor()
+    transaction.on_commit(lambda: executor.submit(_run_job, job.id))
+    return job
+
+
+def _set_stage(job_id, stage: str):
+    ExtractionJob.objects.filter(pk=job_id).update(
+        stage=stage, progress=STAGE_PROGRESS.get(stage, 0), updated_at=timezone.now()
+    )
+
+
+def _run_job(job_id):
+    close_old_connections()
+    try:
+        # claim the job; another process may have resumed it already
+        claimed = ExtractionJob.objects.filter(
+            pk=job_id, status=ExtractionJob.Status.QUEUED
+        ).update(status=ExtractionJob.Status.RUNNING, updated_at=timezone.now())
+        if not claimed:
+            return
+
+        job = ExtractionJob.objects.get(pk=job_id)
+        try:
+            # renders are charged to the job's owner, also for jobs resumed after a restart
+            with charging(user_key(job.user_id)):
+                result = flights.do(
+                    "skills:" + canonicalize_url(job.url),
+                    lambda: run_skills_pipeline(job.url, on_stage=lambda s: _set_stage(job_id, s)),
+                )
+            result = {**result, "url": job.url}
+        except PipelineError as e:
+            _finish(job_id, ExtractionJob.Status.FAILED, error=str(e))
+        except Exception as e:
+            _finish(job_id, ExtractionJob.Status.FAILED, error=f"Unexpected error: {e}")
+        else:
+            _finish(job_id, ExtractionJob.Status.SUCCEEDED, result=result)
+    finally:
+        close_old_connections()
+
+
+def _finish(job_id, status: str, result=None, error: str = ""):
+    ExtractionJob.objects.filter(pk=job_id).update(
+        status=status,
+        stage="done",
+        progress=STAGE_PROGRESS["done"],
+        result=result,
+        error=error,
+        updated_at=timezone.now(),
+        finished_at=timezone.now(),
+    )
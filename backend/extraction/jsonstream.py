@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental parsing of a streamed JSON object.
+
+The LLM's analysis arrives token by token. JsonFieldStream is fed those
+chunks and hands back each top-level ``key: value`` pair as soon as the value
+is complete, so callers can forward fields long before the object closes.
+"""
+
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class JsonFieldStream:
+    """Feed chunks of one JSON object; get back its top-level fields as they complete."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.closed = False
+
+    def _skip(self, chars: str):
+        while self.pos < len(self.buffer) and self.buffer[self.pos] in chars:
+            self.pos += 1
+
+    def feed(self, chunk: str) -> list:
+        """Add ``chunk`` and return the ``(key, value)`` pairs completed by it."""
+        self.buffer += chunk
+        fields = []
+        while not self.closed:
+            start = self.pos
+            self._skip(_WHITESPACE)
+            if not self.started:
+                if self.pos >= len(self.buffer):
+                    break
+                if self.buffer[self.pos] != "{":
+                    raise ValueError("expected a JSON object")
+                self.pos += 1
+                self.started = True
+                continue
+            self._skip(_WHITESPACE + ",")
+            if self.pos >= len(self.buffer):
+                break
+            if self.buffer[self.pos] == "}":
+                self.closed = True
+                break
+
+            try:
+                key, end = _decoder.raw_decode(self.buffer, self.pos)
+                colon = self.buffer.index(":", end)
+                value_at = colon + 1
+                while value_at < len(self.buffer) and self.buffer[value_at] in _WHITESPACE:
+                    value_at += 1
+                value, end = _decoder.raw_decode(self.buffer, value_at)
+            except ValueError:
+                self.pos = start  # incomplete; wait for more
+                break
+            # a number at the end of the buffer may still be growing
+            rest = self.buffer[end:].lstrip(_WHITESPACE)
+            if not rest:
+                self.pos = start
+                break
+            fields.append((key, value))
+            self.pos = end
+        return fields
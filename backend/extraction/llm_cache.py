@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of analyze_jd results.
+
+Entries live in the AnalysisCacheEntry table, keyed by a hash of the
+whitespace-normalized JD text, the prompt version, the model and the
+temperature. The prompt version is a hash of the prompt template, so editing
+the prompt changes every key; entries written under other prompt versions are
+purged as new results come in. Entries expire after LLM_CACHE_TTL and the
+least recently used ones are evicted beyond LLM_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import timedelta
+
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AnalysisCacheEntry
+
+LLM_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_LLM_CACHE_TTL", str(30 * 24 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+def prompt_version(template: str) -> str:
+    return hashlib.sha256(template.encode()).hexdigest()[:16]
+
+
+def analysis_key(jd_text: str, version: str, model: str, temperature: float) -> str:
+    normalized = " ".join(jd_text.split())
+    raw = "\0".join((normalized, version, model, repr(float(temperature))))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class AnalysisCache:
+    """DB-backed TTL/LRU cache with process-local hit/miss counters."""
+
+    def __init__(self, ttl: int = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved_ms = 0
+
+    def get(self, key: str):
+        """Return the cached analysis for ``key``, or None."""
+        cutoff = timezone.now() - timedelta(seconds=self.ttl)
+        try:
+            entry = AnalysisCacheEntry.objects.filter(key=key, created_at__gte=cutoff).first()
+            if entry is not None:
+                AnalysisCacheEntry.objects.filter(key=key).update(
+                    hits=F("hits") + 1, last_used_at=timezone.now()
+                )
+        except DatabaseError as e:
+            print(f"analysis cache unavailable: {e}")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.latency_saved_ms += entry.latency_ms
+        return entry.result
+
+    def put(self, key: str, result: dict, version: str, model: str, latency: float):
+        """Store ``result``; ``latency`` (seconds) is what a later hit saves."""
+        try:
+            AnalysisCacheEntry.objects.update_or_create(
+                key=key,
+                defaults={
+                    "prompt_version": version,
+                    "model": model,
+                    "result": result,
+                    "latency_ms": int(latency * 1000),
+                    "hits": 0,
+                    "created_at": timezone.now(),
+                    "last_used_at": timezone.now(),
+                },
+            )
+            self._evict(version)
+        except DatabaseError as e:
+            print(f"analysis cache unavailable: {e}")
+
+    def _evict(self, version: str):
+        entries = AnalysisCacheEntry.objects
+        entries.exclude(prompt_version=version).delete()
+        entries.filter(created_at__lt=timezone.now() - timedelta(seconds=self.ttl)).delete()
+        overflow = entries.count() - self.max_entries
+        if overflow > 0:
+            oldest = entries.order_by("last_used_at").values_list("key", flat=True)[:overflow]
+            entries.filter(key__in=list(oldest)).delete()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "latency_saved_s": round(self.latency_saved_ms / 1000, 1),
+            }
+
+
+analysis_cache = AnalysisCache()
@@ -0,0 +1,268 @@
+import json
+import multiprocessing
+import re
+import resource
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from extraction.browser import BrowserPool
+from extraction.cleaner import DEFAULT_NOISE_PHRASES, get_cleaner
+from extraction.extractor import _clean_text, _extract_from_html
+from extraction.readability import extract_main_text
+from extraction.resolver import resolver
+from extraction.skills import TAXONOMY_PATH, SkillMatcher
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / "samples"
+
+# container selectors of the pre-registry extractor, used as the baseline
+LEGACY_SELECTORS = {
+    "icims.html": "div#jobcontent",
+    "workday.html": "div[data-automation-id=jobPostingDescription]",
+    "greenhouse.html": "div.job",
+    "ashby.html": "div[data-testid=JobDescription]",
+    "lever.html": "div.posting",
+    "smartrecruiters.html": "div.job-sections",
+    "bamboohr.html": "div#content",
+}
+
+SAMPLE_PAGE = b"""<!doctype html>
+<html><head><title>Software Engineer</title></head>
+<body><main><h1>Software Engineer</h1>
+<p>Build and operate backend services in Python and Go on AWS.</p>
+</main></body></html>
+"""
+
+
+class _SampleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(SAMPLE_PAGE)))
+        self.end_headers()
+        self.wfile.write(SAMPLE_PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve_sample():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SampleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/job"
+
+
+def load_samples() -> list:
+    """Return ``(name, url, html)`` for every saved page in the samples directory."""
+    index = json.loads((SAMPLES_DIR / "index.json").read_text(encoding="utf-8"))
+    return [
+        (name, url, (SAMPLES_DIR / name).read_text(encoding="utf-8")) for name, url in index.items()
+    ]
+
+
+def _legacy_extract(name: str, html: str) -> str:
+    """Full BeautifulSoup tree with global noise passes, as before the site registry."""
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup.find_all(["script", "style", "nav", "header", "footer", "button", "aside"]):
+        tag.decompose()
+    for selector in [
+        {"class": "navigation"},
+        {"class": "nav"},
+        {"class": "menu"},
+        {"class": "footer"},
+        {"class": "header"},
+        {"class": "sidebar"},
+        {"id": "header"},
+        {"id": "footer"},
+        {"id": "navigation"},
+    ]:
+        for element in soup.find_all(attrs=selector):
+            element.decompose()
+    # unknown sites used the first <main>/<article>/role=main, else the whole page
+    selector = LEGACY_SELECTORS.get(name, "main, article, div[role=main]")
+    container = soup.select_one(selector) or soup
+    return container.get_text(" ", strip=True)
+
+
+def _legacy_clean(text: str) -> str:
+    """_clean_text before the cleaner module: one regex plus a replace per phrase."""
+    text = re.sub(
+        r"\b(expand_more|expand_less|person_outline|location_on|work|attach_money|schedule|keyboard_arrow_down|keyboard_arrow_up)\b",
+        "",
+        text,
+        flags=re.IGNORECASE,
+    )
+    text = re.sub(r"\s+", " ", text)
+    for noise in DEFAULT_NOISE_PHRASES:
+        text = text.replace(noise, "")
+    return text.strip()
+
+
+def _peak_rss_kb(fn) -> int:
+    """Peak RSS growth (KiB) while ``fn`` runs in a forked child process."""
+    ctx = multiprocessing.get_context("fork")
+    reader, writer = ctx.Pipe(duplex=False)
+
+    def target():
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        fn()
+        writer.send(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+
+    proc = ctx.Process(target=target)
+    proc.start()
+    grown = reader.recv()
+    proc.join()
+    return grown
+
+
+class Command(BaseCommand):
+    help = "Benchmark the job description extraction pipeline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("suite", choices=["browser", "parse", "generic", "clean", "skills"])
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--url", help="Page to render (defaults to a local sample page)")
+
+    def handle(self, *args, **options):
+        getattr(self, f"bench_{options['suite']}")(options)
+
+    def report(self, label, samples):
+        samples_ms = [s * 1000 for s in samples]
+        self.stdout.write(
+            f"{label:<12} n={len(samples_ms):<4} "
+            f"mean={statistics.mean(samples_ms):8.1f} ms  "
+            f"p50={statistics.median(samples_ms):8.1f} ms  "
+            f"max={max(samples_ms):8.1f} ms"
+        )
+
+    def bench_browser(self, options):
+        """Per-render latency with a fresh browser per call vs. a warm pool."""
+        server = None
+        allow_private = resolver.allow_private
+        url = options["url"]
+        if not url:
+            server, url = _serve_sample()
+            # the sample is served on loopback, which renders otherwise refuse
+            resolver.allow_private = True
+
+        async def render(page):
+            await page.goto(url, timeout=30000)
+            return await page.content()
+
+        try:
+            cold = []
+            for _ in range(options["iterations"]):
+                pool = BrowserPool(size=1)
+                start = time.perf_counter()
+                pool.run(render, timeout=60)
+                cold.append(time.perf_counter() - start)
+                pool.shutdown()
+
+            pool = BrowserPool(size=1)
+            pool.run(render, timeout=60)  # launch outside the measurement
+            warm = []
+            for _ in range(options["iterations"]):
+                start = time.perf_counter()
+                pool.run(render, timeout=60)
+                warm.append(time.perf_counter() - start)
+            stats = pool.stats()
+            pool.shutdown()
+        finally:
+            resolver.allow_private = allow_private
+            if server is not None:
+                server.shutdown()
+
+        self.report("cold", cold)
+        self.report("warm", warm)
+        self.stdout.write(self.style.SUCCESS(f"pool stats: {stats}"))
+
+    def bench_parse(self, options):
+        """Parse time and peak memory of the site extractors vs. the legacy full-tree parse."""
+        samples = [s for s in load_samples() if s[0] in LEGACY_SELECTORS]
+        variants = {
+            "legacy": lambda name, url, html: _legacy_extract(name, html),
+            "registry": lambda name, url, html: _extract_from_html(html, url),
+        }
+        # measured first, in fresh forks, so earlier runs don't inflate the high-water mark
+        for label, fn in variants.items():
+            peak = _peak_rss_kb(lambda fn=fn: [fn(*s) for s in samples])
+            self.stdout.write(f"peak RSS growth ({label}): {peak} KiB")
+
+        self.stdout.write(f"{'sample':<22}{'variant':<10}{'mean ms':>10}{'chars':>8}")
+        for name, url, html in samples:
+            for label, fn in variants.items():
+                timings = []
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    text = fn(name, url, html)
+                    timings.append(time.perf_counter() - start)
+                mean_ms = statistics.mean(timings) * 1000
+                self.stdout.write(f"{name:<22}{label:<10}{mean_ms:>10.2f}{len(text):>8}")
+
+    def bench_generic(self, options):
+        """Generic-path extraction time and output size over the whole sample corpus."""
+        variants = {
+            "legacy": lambda name, html: _clean_text(_legacy_extract(f"generic:{name}", html)),
+            "scorer": lambda name, html: _clean_text(extract_main_text(html)),
+        }
+        totals = {label: [0.0, 0] for label in variants}
+        self.stdout.write(f"{'sample':<22}{'variant':<10}{'mean ms':>10}{'chars':>8}")
+        for name, _url, html in load_samples():
+            for label, fn in variants.items():
+                timings = []
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    text = fn(name, html)
+                    timings.append(time.perf_counter() - start)
+                mean_ms = statistics.mean(timings) * 1000
+                totals[label][0] += mean_ms
+                totals[label][1] += len(text)
+                self.stdout.write(f"{name:<22}{label:<10}{mean_ms:>10.2f}{len(text):>8}")
+        for label, (ms, chars) in totals.items():
+            self.stdout.write(
+                self.style.SUCCESS(f"total {label}: {ms:.1f} ms, {chars} chars of output")
+            )
+
+    def bench_clean(self, options):
+        """Text cleaning throughput for inputs from 1 KB to 1 MB."""
+        paragraph = (
+            "Sign in expand_more Senior Engineer  location_on Austin, TX. Build Python services "
+            "on AWS and review designs.\n\n Apply now  Save job Privacy policy keyboard_arrow_down "
+        )
+        cleaner = get_cleaner()
+        variants = {"legacy": _legacy_clean, "cleaner": cleaner.clean}
+        self.stdout.write(f"{'size':<10}{'variant':<10}{'mean ms':>10}{'MB/s':>10}")
+        for size in (1_000, 10_000, 100_000, 1_000_000):
+            text = (paragraph * (size // len(paragraph) + 1))[:size]
+            for label, fn in variants.items():
+                timings = []
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    fn(text)
+                    timings.append(time.perf_counter() - start)
+                mean = statistics.mean(timings)
+                self.stdout.write(
+                    f"{size // 1000:>6} KB  {label:<10}{mean * 1000:>10.3f}{size / mean / 1e6:>10.1f}"
+                )
+
+    def bench_skills(self, options):
+        """Local skill matching: automaton build time and per-JD latency."""
+        start = time.perf_counter()
+        matcher = SkillMatcher(json.loads(TAXONOMY_PATH.read_text(encoding="utf-8")))
+        build_ms = (time.perf_counter() - start) * 1000
+        self.stdout.write(f"taxonomy {matcher.version}: built in {build_ms:.1f} ms")
+
+        texts = [extract_main_text(html) for _, _, html in load_samples()]
+        for size in (1, 10):
+            text = " ".join(texts) * size
+            timings = []
+            for _ in range(options["iterations"]):
+                start = time.perf_counter()
+                result = matcher.extract(text)
+                timings.append(time.perf_counter() - start)
+            self.report(f"{len(text) // 1000} KB JD, {len(result['flat'])} skills", timings)
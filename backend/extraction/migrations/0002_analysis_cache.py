@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("extraction", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalysisCacheEntry",
+            fields=[
+                ("key", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("prompt_version", models.CharField(db_index=True, max_length=32)),
+                ("model", models.CharField(max_length=64)),
+                ("result", models.JSONField()),
+                ("latency_ms", models.PositiveIntegerField(default=0)),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_used_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
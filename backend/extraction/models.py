@@ -1 +1,52 @@
-# Create your models here.
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ExtractionJob(models.Model):
+    """A queued extract_skills run whose state survives a restart."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="extraction_jobs"
+    )
+    url = models.URLField(max_length=2000)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    stage = models.CharField(max_length=30, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+
+
+class AnalysisCacheEntry(models.Model):
+    """A cached analyze_jd result for one (JD text, prompt, model, temperature)."""
+
+    key = models.CharField(max_length=64, primary_key=True)  # sha256 hex
+    prompt_version = models.CharField(max_length=32, db_index=True)
+    model = models.CharField(max_length=64)
+    result = models.JSONField()
+    latency_ms = models.PositiveIntegerField(default=0)  # cost of the original LLM call
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.model}, prompt {self.prompt_version})"
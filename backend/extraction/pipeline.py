@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Fetch -> analyze pipeline behind extract_skills, shared by the synchronous
+view and the background job workers.
+
+Results are stored as a JobDescription per canonical URL. A stored posting
+younger than JD_REFRESH_AFTER is served without any fetch or LLM call; an
+older one is re-fetched, and only re-analyzed if its text changed or the
+analysis prompt did.
+"""
+
+import hashlib
+import os
+from datetime import timedelta
+
+from django.utils import timezone
+
+from applications.models import Job, JobDescription
+
+from .cache import canonicalize_url
+from .condense import condense_jd
+from .extractor import (
+    ANALYZE_JD_PROMPT_VERSION,
+    analyze_jd,
+    analyze_jd_stream,
+    extract_posting,
+    local_analysis,
+)
+
+JD_REFRESH_AFTER = timedelta(hours=int(os.getenv("EXTRACTION_JD_REFRESH_HOURS", "168")))
+
+POSTING_META = ("job_title", "company", "location")
+LOCAL_FIELDS = ("categories", "flat", "leetcode_recommendations")
+
+
+class PipelineError(Exception):
+    """A pipeline stage failed; the message is safe to return to the client."""
+
+
+def _noop(stage: str):
+    pass
+
+
+def skills_payload(url: str, condensed, analysis: dict, posting=None) -> dict:
+    """Shape the extract_skills response; ATS API metadata wins over the LLM's guess."""
+    posting = posting or {}
+
+    def field(name):
+        return posting.get(name) or analysis.get(name, "Not specified")
+
+    return {
+        "url": url,
+        "job_title": field("job_title"),
+        "company": field("company"),
+        "location": field("location"),
+        "responsibilities": analysis.get("responsibilities", []),
+        "requirements": analysis.get("requirements", []),
+        "categories": analysis.get("categories", []),
+        "flat": analysis.get("flat", []),
+        "leetcode_recommendations": analysis.get("leetcode_recommendations", []),
+        "jd_chars": len(condensed.text),
+        "jd_tokens": condensed.tokens_out,
+        "tokens_saved": condensed.tokens_saved,
+    }
+
+
+def _posting_event(url: str, condensed, posting: dict) -> dict:
+    return {
+        "url": url,
+        **{k: posting[k] for k in POSTING_META if posting.get(k)},
+        "jd_chars": len(condensed.text),
+        "jd_tokens": condensed.tokens_out,
+        "tokens_saved": condensed.tokens_saved,
+    }
+
+
+def _local_event(analysis: dict) -> dict:
+    return {k: analysis.get(k, []) for k in LOCAL_FIELDS}
+
+
+def _stored_fields(analysis: dict):
+    for name, value in analysis.items():
+        if name not in LOCAL_FIELDS:
+            yield "field", {"name": name, "value": value}
+
+
+def _title(analysis: dict) -> str:
+    return analysis.get("job_title", "")
+
+
+def _has_current_analysis(stored) -> bool:
+    return (
+        stored is not None
+        and stored.analysis is not None
+        and stored.analysis_version == ANALYZE_JD_PROMPT_VERSION
+    )
+
+
+def _is_fresh(stored) -> bool:
+    return _has_current_analysis(stored) and timezone.now() - stored.fetched_at < JD_REFRESH_AFTER
+
+
+def has_fresh_analysis(url: str) -> bool:
+    """True if extract_skills for ``url`` would be served from storage."""
+    stored = JobDescription.objects.filter(canonical_url=canonicalize_url(url)).first()
+    return _is_fresh(stored)
+
+
+def _store(url: str, key: str, stored, posting: dict, content_hash: str, analysis: dict):
+    now = timezone.now()
+    changed = stored is None or stored.content_hash != content_hash
+    fields = {
+        "text": posting["text"],
+        "content_hash": content_hash,
+        "meta": {k: posting[k] for k in POSTING_META if posting.get(k)},
+        "fetched_at": now,
+        "changed_at": now if changed else stored.changed_at,
+    }
+    # a failed analysis is not stored, so the next request tries again
+    if "error" not in analysis and not (_has_current_analysis(stored) and not changed):
+        fields.update(
+            analysis=analysis, analysis_version=ANALYZE_JD_PROMPT_VERSION, analyzed_at=now
+        )
+    if stored is None or stored.job_id is None:
+        fields["job"] = Job.objects.filter(website__in={url, key}).first()
+    JobDescription.objects.update_or_create(canonical_url=key, defaults=fields)
+
+
+def run_skills_pipeline(url: str, on_stage=_noop, refresh: bool = False) -> dict:
+    """Fetch the posting, analyze it and return the extract_skills payload.
+
+    ``refresh`` forces a fetch even when the stored posting is still fresh.
+    """
+    key = canonicalize_url(url)
+    stored = JobDescription.objects.filter(canonical_url=key).first()
+    if not refresh and _is_fresh(stored):
+        condensed = condense_jd(stored.text)
+        # recompute the local fields so taxonomy and catalog updates apply to stored postings
+        analysis = {**stored.analysis, **local_analysis(condensed.text, _title(stored.analysis))}
+        return skills_payload(url, condensed, analysis, stored.meta)
+
+    on_stage("fetching")
+    try:
+        posting = extract_posting(url)
+    except Exception as e:
+        raise PipelineError(f"Failed to fetch JD: {e}") from e
+
+    content_hash = hashlib.sha256(posting["text"].encode()).hexdigest()
+    condensed = condense_jd(posting["text"])
+    if _has_current_analysis(stored) and stored.content_hash == content_hash:
+        analysis = {**stored.analysis, **local_analysis(condensed.text, _title(stored.analysis))}
+    else:
+        on_stage("analyzing")
+        try:
+            analysis = analyze_jd(condensed.text)
+        except Exception as e:
+            raise PipelineError(f"Skill analysis failed: {e}") from e
+
+    _store(url, key, stored, posting, content_hash, analysis)
+    return skills_payload(url, condensed, analysis, posting)
+
+
+def stream_skills_pipeline(url: str, refresh: bool = False):
+    """run_skills_pipeline as a generator of ``(event, data)`` pairs.
+
+    Events, in order: ``stage``, ``posting`` (metadata of the fetched text),
+    ``skills`` (local extraction), one ``field`` per LLM field as the
+    completion is parsed, and ``done`` with the full extract_skills payload.
+    Stages that are served from storage or cache are emitted at once.
+    """
+    key = canonicalize_url(url)
+    stored = JobDescription.objects.filter(canonical_url=key).first()
+    if not refresh and _is_fresh(stored):
+        condensed = condense_jd(stored.text)
+        analysis = {**stored.analysis, **local_analysis(condensed.text, _title(stored.analysis))}
+        yield "posting", _posting_event(url, condensed, stored.meta)
+        yield "skills", _local_event(analysis)
+        yield from _stored_fields(stored.analysis)
+        yield "done", skills_payload(url, condensed, analysis, stored.meta)
+        return
+
+    yield "stage", {"stage": "fetching"}
+    try:
+        posting = extract_posting(url)
+    except Exception as e:
+        raise PipelineError(f"Failed to fetch JD: {e}") from e
+
+    content_hash = hashlib.sha256(posting["text"].encode()).hexdigest()
+    condensed = condense_jd(posting["text"])
+    yield "posting", _posting_event(url, condensed, posting)
+    yield "skills", _local_event(local_analysis(condensed.text, posting.get("job_title", "")))
+
+    if _has_current_analysis(stored) and stored.content_hash == content_hash:
+        analysis = {**stored.analysis, **local_analysis(condensed.text, _title(stored.analysis))}
+        yield from _stored_fields(stored.analysis)
+    else:
+        yield "stage", {"stage": "analyzing"}
+        fields = analyze_jd_stream(condensed.text)
+        while True:
+            try:
+                name, value = next(fields)
+            except StopIteration as finished:
+                analysis = finished.value
+                break
+            except Exception as e:
+                raise PipelineError(f"Skill analysis failed: {e}") from e
+            yield "field", {"name": name, "value": value}
+
+    _store(url, key, stored, posting, content_hash, analysis)
+    yield "done", skills_payload(url, condensed, analysis, posting)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Local forward proxy that pins Chromium's connections to validated addresses.
+
+Chromium resolves names itself, so checking a URL with the resolver and then
+letting the browser connect leaves a DNS-rebinding window: the name can
+resolve to a public address for the check and a private one for the connect.
+The browser pool therefore sends every request through this proxy. For
+CONNECT tunnels and plain HTTP alike, the proxy looks the host up with the
+shared resolver and dials one of the addresses it validated, so the
+browser never opens a connection of its own.
+
+The proxy runs on the browser pool's event loop and listens on loopback only.
+"""
+
+import asyncio
+from urllib.parse import urlsplit
+
+from .fetcher import CONNECT_TIMEOUT
+from .resolver import UnsafeHost, resolver
+
+MAX_HEAD_BYTES = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+async def _pipe(reader, writer):
+    while data := await reader.read(CHUNK_SIZE):
+        writer.write(data)
+        await writer.drain()
+
+
+def _close(writer):
+    if writer is not None and not writer.is_closing():
+        writer.close()
+
+
+class PinningProxy:
+    """HTTP forward proxy whose upstream connections go to resolver-validated addresses."""
+
+    def __init__(self):
+        self.server = None
+        self.connections = 0
+        self.refused = 0
+
+    async def start(self) -> str:
+        """Start listening on a free loopback port and return the proxy URL."""
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, limit=MAX_HEAD_BYTES)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _open(self, host: str, port: int):
+        addresses = await asyncio.to_thread(resolver.resolve, host)
+        error = None
+        for address in addresses:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.open_connection(address, port), CONNECT_TIMEOUT
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                error = e
+        raise error
+
+    async def _reply(self, writer, status: str):
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        upstream = None
+        try:
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            request_line, *headers = head.split("\r\n")[:-2]
+            method, target, version = request_line.split(" ", 2)
+            if method == "CONNECT":
+                host, _, port = target.rpartition(":")
+                host, port = host.strip("[]"), int(port)
+            else:
+                parts = urlsplit(target)
+                if parts.scheme != "http" or not parts.hostname:
+                    await self._reply(writer, "400 Bad Request")
+                    return
+                host, port = parts.hostname, parts.port or 80
+                path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+            try:
+                upstream_reader, upstream = await self._open(host, port)
+            except UnsafeHost:
+                self.refused += 1
+                await self._reply(writer, "403 Forbidden")
+                return
+            except (OSError, asyncio.TimeoutError):
+                await self._reply(writer, "502 Bad Gateway")
+                return
+            self.connections += 1
+
+            if method == "CONNECT":
+                writer.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+            else:
+                # one request per upstream connection, so a reused proxy
+                # connection can never reach a host that was not checked
+                kept = [h for h in headers if not h.lower().startswith(("proxy-", "connection:"))]
+                lines = [f"{method} {path} {version}", *kept, "Connection: close", "", ""]
+                upstream.write("\r\n".join(lines).encode("latin-1"))
+
+            pipes = [
+                asyncio.ensure_future(_pipe(reader, upstream)),
+                asyncio.ensure_future(_pipe(upstream_reader, writer)),
+            ]
+            # either side closing ends the exchange
+            _, pending = await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, OSError):
+            pass
+        finally:
+            _close(upstream)
+            _close(writer)
+
+    def stats(self) -> dict:
+        return {"connections": self.connections, "refused": self.refused}
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Readability-style main content detection for unknown job sites.
+
+One post-order walk over the lxml tree computes, for every element, the
+amount of visible text, how much of it is link text and how many tags it
+spans. Paragraph-like blocks award a content score to their parent and
+grandparent, and the best scoring block (plus strong siblings) is returned
+as the posting. Each element is visited a constant number of times, so the
+cost is linear in the size of the page.
+"""
+
+import re
+
+from .sites import NOISE_TAGS, container_text, parse_html
+
+SKIP_TAGS = set(NOISE_TAGS) | {"form", "noscript", "svg", "select", "option", "iframe", "head"}
+PARAGRAPH_TAGS = {"p", "li", "pre", "blockquote", "td", "dd", "h1", "h2", "h3", "h4"}
+CANDIDATE_TAGS = {"div", "section", "article", "main", "td", "ul", "body"}
+
+POSITIVE_RE = re.compile(
+    r"job|posting|description|requirement|qualification|responsibilit|content|article|"
+    r"entry|main|body|detail",
+    re.IGNORECASE,
+)
+NEGATIVE_RE = re.compile(
+    r"nav|menu|footer|header|sidebar|comment|cookie|banner|share|social|related|opening|"
+    r"promo|breadcrumb|culture|quote|testimonial|apply|modal|popup|widget",
+    re.IGNORECASE,
+)
+
+MIN_PARAGRAPH_CHARS = 25
+MIN_TEXT_DENSITY = 10  # chars per tag; below this a block is a menu or link list
+SIBLING_SCORE_RATIO = 0.2
+
+
+class _Stats:
+    __slots__ = ("text", "link", "commas", "tags", "score")
+
+    def __init__(self):
+        self.text = 0
+        self.link = 0
+        self.commas = 0
+        self.tags = 1
+        self.score = 0.0
+
+
+def _class_weight(el) -> int:
+    names = f"{el.get('class', '')} {el.get('id', '')}"
+    weight = 0
+    if POSITIVE_RE.search(names):
+        weight += 25
+    if NEGATIVE_RE.search(names):
+        weight -= 25
+    return weight
+
+
+def _tag(el) -> str:
+    return el.tag.lower() if isinstance(el.tag, str) else ""
+
+
+def _unlikely(el, tag: str) -> bool:
+    """Comment threads, related-job lists and the like, judged by class/id."""
+    if tag in ("html", "body", "main", "article"):
+        return False
+    return _class_weight(el) < 0
+
+
+def score_tree(root) -> dict:
+    """Return ``{element: _Stats}`` for every non-noise element under ``root``."""
+    stats = {}
+    # reversed pre-order visits every descendant before its ancestors
+    for el in reversed(list(root.iter())):
+        tag = _tag(el)
+        if not tag or tag in SKIP_TAGS or _unlikely(el, tag):
+            continue
+        st = stats.get(el)
+        if st is None:
+            st = stats[el] = _Stats()
+
+        own = (el.text or "").strip()
+        st.text += len(own)
+        st.commas += own.count(",")
+        for child in el:
+            tail = (child.tail or "").strip()
+            st.text += len(tail)
+            st.commas += tail.count(",")
+            child_st = stats.get(child)
+            if child_st is not None:
+                st.text += child_st.text
+                st.link += child_st.link
+                st.commas += child_st.commas
+                st.tags += child_st.tags
+        if tag == "a":
+            st.link = st.text
+
+        if tag in PARAGRAPH_TAGS and st.text >= MIN_PARAGRAPH_CHARS:
+            points = 1 + st.commas + min(st.text // 100, 3)
+            parent = el.getparent()
+            if parent is not None:
+                stats.setdefault(parent, _Stats()).score += points
+                grandparent = parent.getparent()
+                if grandparent is not None:
+                    stats.setdefault(grandparent, _Stats()).score += points / 2
+    return stats
+
+
+def _final_score(el, st: _Stats) -> float:
+    link_density = st.link / st.text if st.text else 1.0
+    return (st.score + _class_weight(el)) * (1 - link_density)
+
+
+def best_blocks(root) -> list:
+    """Return the top scoring block and any strong siblings, in document order."""
+    stats = score_tree(root)
+    best, best_score = None, 0.0
+    for el, st in stats.items():
+        if _tag(el) not in CANDIDATE_TAGS or st.score <= 0:
+            continue
+        if st.text / st.tags < MIN_TEXT_DENSITY:
+            continue
+        score = _final_score(el, st)
+        if score > best_score:
+            best, best_score = el, score
+    if best is None:
+        return []
+
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+    threshold = max(10.0, best_score * SIBLING_SCORE_RATIO)
+    blocks = []
+    for sibling in parent:
+        st = stats.get(sibling)
+        if sibling is best or (
+            st is not None
+            and _tag(sibling) in CANDIDATE_TAGS
+            and _final_score(sibling, st) >= threshold
+        ):
+            blocks.append(sibling)
+    return blocks
+
+
+def _block_text(block) -> str:
+    for el in list(block.iterdescendants()):
+        if el.getparent() is not None and _unlikely(el, _tag(el)):
+            el.drop_tree()
+    return container_text(block)
+
+
+def extract_main_text(html: str) -> str:
+    """Text of the most likely job description block, or of the whole page."""
+    root = parse_html(html)
+    if root is None:
+        return ""
+    blocks = best_blocks(root)
+    if not blocks:
+        return container_text(root)
+    return " ".join(_block_text(b) for b in blocks)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Resolve-once DNS cache shared by the SSRF guard, the fetcher and the browser.
+
+A hostname is looked up once, every A/AAAA record is checked, and the
+validated addresses are reused until the entry expires. The fetcher connects
+straight to a validated address, so a name cannot resolve to a public IP for
+the guard and to an internal one for the request (DNS rebinding).
+
+``getaddrinfo`` does not expose record TTLs, so entries live for
+EXTRACTION_DNS_TTL seconds, which should be kept at or below typical record
+TTLs.
+"""
+
+import ipaddress
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+
+DNS_TTL_SECONDS = int(os.getenv("EXTRACTION_DNS_TTL", "60"))
+DNS_MAX_ENTRIES = int(os.getenv("EXTRACTION_DNS_MAX_ENTRIES", "1024"))
+# local development only: lets the extractor reach localhost and LAN hosts
+ALLOW_PRIVATE_HOSTS = os.getenv("EXTRACTION_ALLOW_PRIVATE_HOSTS", "") == "1"
+
+
+class UnsafeHost(Exception):
+    """The host does not resolve, or resolves to a non-public address."""
+
+
+def is_public_address(address: str) -> bool:
+    return ipaddress.ip_address(address.split("%")[0]).is_global
+
+
+class Resolver:
+    """Thread-safe TTL cache of validated addresses per hostname."""
+
+    def __init__(
+        self,
+        ttl: int = DNS_TTL_SECONDS,
+        max_entries: int = DNS_MAX_ENTRIES,
+        allow_private: bool = ALLOW_PRIVATE_HOSTS,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.allow_private = allow_private
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, host: str) -> list:
+        try:
+            infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+        except (socket.gaierror, UnicodeError) as e:
+            raise UnsafeHost(f"cannot resolve {host}: {e}") from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses:
+            raise UnsafeHost(f"no addresses for {host}")
+        if not self.allow_private:
+            for address in addresses:
+                if not is_public_address(address):
+                    raise UnsafeHost(f"{host} resolves to non-public address {address}")
+        return addresses
+
+    def resolve(self, host: str) -> list:
+        """Return the validated addresses for ``host``; raises UnsafeHost."""
+        host = (host or "").lower().rstrip(".")
+        if not host:
+            raise UnsafeHost("missing host")
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(host)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # failures are not cached; the lookup runs outside the lock
+        addresses = self._lookup(host)
+        with self._lock:
+            self._entries[host] = (now, addresses)
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return addresses
+
+    def is_safe(self, host: str) -> bool:
+        try:
+            self.resolve(host)
+            return True
+        except UnsafeHost:
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+resolver = Resolver()
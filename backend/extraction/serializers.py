@@ -1,10 +1,20 @@
 from rest_framework import serializers
 
+from .batch import BATCH_MAX_URLS
+from .models import ExtractionJob
+
 
 class ExtractRequestSerializer(serializers.Serializer):
     url = serializers.URLField()
 
 
+class BatchExtractRequestSerializer(serializers.Serializer):
+    urls = serializers.ListField(
+        child=serializers.URLField(), min_length=1, max_length=BATCH_MAX_URLS
+    )
+    analyze = serializers.BooleanField(required=False, default=True)
+
+
 class ExtractResponseSerializer(serializers.Serializer):
     url = serializers.URLField()
     text = serializers.CharField()
@@ -21,3 +31,24 @@ class SkillExtractGenericResp(serializers.Serializer):
     categories = SkillCategory(many=True)
     flat = serializers.ListField(child=serializers.CharField())
     jd_chars = serializers.IntegerField()
+    jd_tokens = serializers.IntegerField()
+    tokens_saved = serializers.IntegerField()
+
+
+class ExtractionJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = ExtractionJob
+        fields = [
+            "job_id",
+            "url",
+            "status",
+            "stage",
+            "progress",
+            "result",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
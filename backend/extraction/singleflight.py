@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Single-flight coalescing of identical extractions.
+
+When several requests for the same posting arrive together, the first one
+runs the fetch/render/LLM work and the others wait for its result (or its
+error) instead of repeating it. ``SingleFlight`` coalesces threads within one
+process. ``FileSingleFlight`` additionally takes an flock per key, so worker
+processes sharing EXTRACTION_SINGLEFLIGHT_DIR run the work once and hand the
+JSON result to the processes that were waiting on the lock.
+
+``StreamFlight`` does the same for streamed work: one helper thread runs it
+and every concurrent subscriber replays the events it publishes.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process coalescing only
+    fcntl = None
+
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("EXTRACTION_SINGLEFLIGHT_TIMEOUT", "90"))
+SINGLEFLIGHT_DIR = os.getenv("EXTRACTION_SINGLEFLIGHT_DIR", "")
+# how long a finished result is handed to other processes that queued behind it
+SINGLEFLIGHT_RESULT_TTL = float(os.getenv("EXTRACTION_SINGLEFLIGHT_RESULT_TTL", "15"))
+
+
+class FlightTimeout(Exception):
+    """Waited longer than the timeout for the in-flight call to finish."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key: str, fn, timeout: float = SINGLEFLIGHT_TIMEOUT):
+        """Return ``fn()``, sharing one call among concurrent callers with the same key.
+
+        Waiters re-raise the leader's exception, or FlightTimeout after ``timeout``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise FlightTimeout(f"timed out waiting for the in-flight extraction of {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._lead(key, fn, timeout)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _lead(self, key: str, fn, timeout: float):
+        return fn()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "shared": self.shared,
+                "timeouts": self.timeouts,
+            }
+
+
+class FileSingleFlight(SingleFlight):
+    """SingleFlight whose leaders also coordinate across processes through flock."""
+
+    def __init__(self, directory: str, result_ttl: float = SINGLEFLIGHT_RESULT_TTL):
+        super().__init__()
+        self.directory = directory
+        self.result_ttl = result_ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str):
+        name = hashlib.sha256(key.encode()).hexdigest()
+        base = os.path.join(self.directory, name)
+        return base + ".lock", base + ".json"
+
+    def _read_fresh(self, path: str):
+        try:
+            if time.time() - os.path.getmtime(path) > self.result_ttl:
+                return None
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _lead(self, key: str, fn, timeout: float):
+        lock_path, result_path = self._paths(key)
+        deadline = time.monotonic() + timeout
+        with open(lock_path, "a") as lock:
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        with self._lock:
+                            self.timeouts += 1
+                        raise FlightTimeout(
+                            f"timed out waiting for the in-flight extraction of {key}"
+                        ) from None
+                    time.sleep(0.1)
+            try:
+                # another process may have just finished the same work
+                result = self._read_fresh(result_path)
+                if result is not None:
+                    with self._lock:
+                        self.shared += 1
+                    return result
+                result = fn()
+                tmp_path = f"{result_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as fh:
+                    json.dump(result, fh)
+                os.replace(tmp_path, result_path)
+                return result
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class _Run:
+    def __init__(self):
+        self.events = []
+        self.finished = False
+        self.error = None
+        self.cond = threading.Condition()
+
+    def publish(self, event):
+        with self.cond:
+            self.events.append(event)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.finished = True
+            self.error = error
+            self.cond.notify_all()
+
+
+class StreamFlight:
+    """Share one run of streamed work among concurrent subscribers with the same key.
+
+    The run happens on a helper thread, so it finishes for the others when the
+    subscriber that started it goes away.
+    """
+
+    def __init__(self):
+        self._runs = {}
+        self._lock = threading.Lock()
+
+        self.leaders = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def subscribe(self, key: str, fn, timeout: float = SINGLEFLIGHT_TIMEOUT):
+        """Yield every event of the run for ``key``, starting ``fn(publish)`` if none is in flight.
+
+        Late subscribers get the events published so far first. The run's
+        exception is re-raised after its events; FlightTimeout is raised if no
+        event arrives for ``timeout`` seconds.
+        """
+        with self._lock:
+            run = self._runs.get(key)
+            if run is None:
+                run = self._runs[key] = _Run()
+                self.leaders += 1
+                # the caller's context goes along, e.g. whose throttle bucket pays
+                context = contextvars.copy_context()
+                threading.Thread(
+                    target=context.run,
+                    args=(self._lead, key, run, fn),
+                    name="extraction-stream",
+                    daemon=True,
+                ).start()
+            else:
+                self.shared += 1
+
+        seen = 0
+        while True:
+            with run.cond:
+                while seen == len(run.events) and not run.finished:
+                    if not run.cond.wait(timeout):
+                        with self._lock:
+                            self.timeouts += 1
+                        raise FlightTimeout(
+                            f"timed out waiting for the in-flight extraction of {key}"
+                        )
+                events = run.events[seen:]
+                seen = len(run.events)
+                finished, error = run.finished, run.error
+            yield from events
+            if finished:
+                if error is not None:
+                    raise error
+                return
+
+    def _lead(self, key: str, run: _Run, fn):
+        error = None
+        try:
+            fn(run.publish)
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                del self._runs[key]
+            run.finish(error)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._runs), "leaders": self.leaders, "shared": self.shared}
+
+
+streams = StreamFlight()
+
+flights = (
+    FileSingleFlight(SINGLEFLIGHT_DIR) if SINGLEFLIGHT_DIR and fcntl is not None else SingleFlight()
+)
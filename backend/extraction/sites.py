@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Per-ATS extractors, dispatched by hostname suffix.
+
+Each extractor knows the XPath of the posting container on its ATS. The page
+is parsed once with lxml, only the matched container is cleaned and walked,
+and unknown hosts fall through to the generic extractor. Extra boards can be
+plugged in with ``register``.
+"""
+
+from urllib.parse import urlparse
+
+import lxml.html
+from lxml import etree
+
+NOISE_TAGS = ("script", "style", "nav", "header", "footer", "button", "aside")
+NOISE_CLASSES = ("navigation", "nav", "menu", "footer", "header", "sidebar")
+NOISE_IDS = ("header", "footer", "navigation")
+
+
+def _class_token(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_NOISE = etree.XPath(
+    ".//*["
+    + " or ".join(
+        [f"self::{t}" for t in NOISE_TAGS]
+        + [_class_token(c) for c in NOISE_CLASSES]
+        + [f"@id='{i}'" for i in NOISE_IDS]
+    )
+    + "]"
+)
+_TEXT = etree.XPath(".//text()")
+
+
+def container_text(element) -> str:
+    """Visible text of ``element`` with noise elements removed, space-joined."""
+    for noise in _NOISE(element):
+        if noise.getparent() is not None:
+            noise.drop_tree()
+    return " ".join(s.strip() for s in _TEXT(element) if s.strip())
+
+
+def parse_html(html: str):
+    """Parse ``html`` with lxml, returning None for empty or unparseable input."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+class SiteExtractor:
+    """Extracts the posting container of one ATS; the first matching XPath wins.
+
+    ``ready_selector`` is the CSS selector the Playwright fallback waits for
+    before it snapshots the page.
+    """
+
+    def __init__(self, name: str, xpaths: list, ready_selector: str = ""):
+        self.name = name
+        self.xpaths = [etree.XPath(x) for x in xpaths]
+        self.ready_selector = ready_selector
+
+    def extract(self, html: str) -> str:
+        root = parse_html(html)
+        if root is None:
+            return ""
+        for xpath in self.xpaths:
+            found = xpath(root)
+            if found:
+                return container_text(found[0])
+        return ""
+
+
+_registry = {}
+
+
+def register(extractor: SiteExtractor, *suffixes: str):
+    """Route hosts equal to or ending in ``.suffix`` to ``extractor``."""
+    for suffix in suffixes:
+        _registry[suffix.lower()] = extractor
+
+
+def extractor_for(url: str):
+    """Return the extractor for ``url``'s host, or None for the generic path."""
+    labels = (urlparse(url).hostname or "").lower().split(".")
+    for i in range(len(labels)):
+        extractor = _registry.get(".".join(labels[i:]))
+        if extractor is not None:
+            return extractor
+    return None
+
+
+register(
+    SiteExtractor("icims", ["//div[@id='jobcontent']"], ready_selector="#jobcontent"),
+    "icims.com",
+)
+register(
+    SiteExtractor(
+        "workday",
+        [
+            "//div[@data-automation-id='jobPostingDescription']",
+            "//div[@data-automation-id='richTextArea']",
+            "//div[@role='text']",
+            "//section",
+        ],
+        ready_selector="[data-automation-id='jobPostingDescription']",
+    ),
+    "myworkdayjobs.com",
+)
+register(
+    SiteExtractor("greenhouse", [f"//div[{_class_token('job')}]"], ready_selector="div.job"),
+    "greenhouse.io",
+)
+register(
+    SiteExtractor(
+        "ashby",
+        ["//div[@data-testid='JobDescription']"],
+        ready_selector="[data-testid='JobDescription']",
+    ),
+    "ashbyhq.com",
+)
+register(
+    SiteExtractor("lever", [f"//div[{_class_token('posting')}]"], ready_selector="div.posting"),
+    "lever.co",
+)
+register(
+    SiteExtractor(
+        "smartrecruiters",
+        [f"//div[{_class_token('job-sections')}]"],
+        ready_selector="div.job-sections",
+    ),
+    "smartrecruiters.com",
+)
+register(
+    SiteExtractor("bamboohr", ["//div[@id='content']"], ready_selector="#content"),
+    "bamboohr.com",
+)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Local skill extraction over a versioned taxonomy.
+
+skill_taxonomy.json maps each category to canonical skill names and their
+synonyms. All synonyms are compiled into one Aho-Corasick automaton, so a JD
+is scanned once regardless of taxonomy size. Synonyms written in lower case
+match any case; synonyms containing capitals ("Go", "R", "Spark") only match
+exactly, which keeps short or common-word names from firing on prose.
+"""
+
+import json
+from pathlib import Path
+
+TAXONOMY_PATH = Path(__file__).resolve().parent / "skill_taxonomy.json"
+MAX_SKILLS_PER_CATEGORY = 9
+
+# characters that continue a token, so "C" does not match inside "C++" or "R&D"
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_+#&")
+# very short names also refuse these trailers ("Go-to-market", "C-level")
+_SHORT_TRAILERS = frozenset("-/'")
+
+
+def _lower_same_length(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # a few characters (e.g. "İ") grow when lowered; keep offsets aligned
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every synonym in a taxonomy."""
+
+    def __init__(self, taxonomy: dict):
+        self.version = taxonomy["version"]
+        self.categories = list(taxonomy["categories"])
+        self.category_of = {}
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(length, skill, exact form or None)]
+        for category, skills in taxonomy["categories"].items():
+            for skill, synonyms in skills.items():
+                self.category_of[skill] = category
+                for synonym in synonyms:
+                    self._add(synonym, skill)
+        self._link()
+
+    def _add(self, synonym: str, skill: str):
+        key = synonym.lower()
+        exact = synonym if synonym != key else None
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(key), skill, exact))
+
+    def _link(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _accept(self, text: str, lowered: str, start: int, end: int, exact) -> bool:
+        if start > 0 and lowered[start - 1] in _TOKEN_CHARS:
+            return False
+        if end < len(text):
+            nxt = lowered[end]
+            if nxt in _TOKEN_CHARS or (end - start <= 2 and nxt in _SHORT_TRAILERS):
+                return False
+        return exact is None or text[start:end] == exact
+
+    def find(self, text: str) -> list:
+        """Return ``(start, end, skill)`` for leftmost-longest, non-overlapping matches."""
+        lowered = _lower_same_length(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, skill, exact in out[state]:
+                start = i - length + 1
+                if self._accept(text, lowered, start, i + 1, exact):
+                    found.append((start, i + 1, skill))
+
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        matches = []
+        covered = 0
+        for start, end, skill in found:
+            if start >= covered:
+                matches.append((start, end, skill))
+                covered = end
+        return matches
+
+    def extract(self, text: str) -> dict:
+        """Return the ``categories`` / ``flat`` fields of the analysis for ``text``."""
+        counts = {}
+        first_seen = {}
+        for start, _, skill in self.find(text):
+            counts[skill] = counts.get(skill, 0) + 1
+            first_seen.setdefault(skill, start)
+
+        by_category = {}
+        for skill in sorted(counts, key=lambda s: (-counts[s], first_seen[s])):
+            by_category.setdefault(self.category_of[skill], []).append(skill)
+
+        categories = [
+            {"name": name, "skills": by_category[name][:MAX_SKILLS_PER_CATEGORY]}
+            for name in self.categories
+            if name in by_category
+        ]
+        flat = [skill for category in categories for skill in category["skills"]]
+        return {"categories": categories, "flat": flat}
+
+
+_default = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    global _default
+    if _default is None:
+        with open(TAXONOMY_PATH, encoding="utf-8") as fh:
+            _default = SkillMatcher(json.load(fh))
+    return _default
+
+
+def extract_skills(text: str) -> dict:
+    return get_skill_matcher().extract(text)
@@ -1 +1,149 @@
-# Create your tests here.
+import threading
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .ats_api import FAST_PATHS, fetch_posting
+from .cache import jd_cache
+from .extractor import extract_posting
+from .resolver import resolver
+
+API_SAMPLES = Path(__file__).resolve().parent / "samples" / "api"
+
+# request path on the stand-in server -> recorded response
+ROUTES = {
+    "/v1/boards/acme/jobs/4012345": "greenhouse.json",
+    "/v0/postings/acme/0b1c2d3e-1111-2222-3333-444455556666": "lever.json",
+    "/posting-api/job-board/acme": "ashby.json",
+    "/v1/companies/Acme/postings/743999912345": "smartrecruiters.json",
+    "/wday/cxs/acme/External/job/Austin-TX/Senior-Software-Engineer_R12345": "workday.json",
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = ROUTES.get(self.path.split("?")[0])
+        if name is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = (API_SAMPLES / name).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class AtsApiFastPathTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.patches = ExitStack()
+        # the stand-in server is on loopback, which the SSRF guard refuses
+        cls.patches.enter_context(mock.patch.object(resolver, "allow_private", True))
+        for fast_path in FAST_PATHS:
+            cls.patches.enter_context(mock.patch.object(fast_path, "base", base))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patches.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        jd_cache.clear()
+
+    def assertPosting(self, url, source, title, company, location):
+        posting = fetch_posting(url)
+        self.assertIsNotNone(posting)
+        self.assertEqual(posting.source, source)
+        self.assertEqual(posting.title, title)
+        self.assertEqual(posting.company, company)
+        self.assertEqual(posting.location, location)
+        self.assertIn("Design, build and operate backend services", posting.text)
+        self.assertIn("PostgreSQL, Redis and Kafka", posting.text)
+        self.assertNotIn("<li>", posting.text)
+
+    def test_greenhouse(self):
+        self.assertPosting(
+            "https://boards.greenhouse.io/acme/jobs/4012345?gh_src=abc",
+            "greenhouse",
+            "Senior Software Engineer, Platform",
+            "Acme",
+            "New York, NY",
+        )
+
+    def test_greenhouse_embed(self):
+        posting = fetch_posting("https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345")
+        self.assertEqual(posting.source, "greenhouse")
+
+    def test_lever(self):
+        self.assertPosting(
+            "https://jobs.lever.co/acme/0b1c2d3e-1111-2222-3333-444455556666",
+            "lever",
+            "Senior Software Engineer, Platform",
+            "acme",
+            "San Francisco, CA",
+        )
+
+    def test_ashby_picks_posting_from_board(self):
+        self.assertPosting(
+            "https://jobs.ashbyhq.com/acme/0b1c2d3e-1111-2222-3333-444455556666",
+            "ashby",
+            "Senior Software Engineer, Platform",
+            "acme",
+            "Remote - US",
+        )
+
+    def test_smartrecruiters(self):
+        self.assertPosting(
+            "https://jobs.smartrecruiters.com/Acme/743999912345-senior-software-engineer",
+            "smartrecruiters",
+            "Senior Software Engineer, Platform",
+            "Acme Corporation",
+            "Austin, TX, us",
+        )
+
+    def test_workday_with_locale(self):
+        self.assertPosting(
+            "https://acme.wd5.myworkdayjobs.com/en-US/External/job/Austin-TX/"
+            "Senior-Software-Engineer_R12345",
+            "workday",
+            "Senior Software Engineer, Platform",
+            "Acme Inc.",
+            "Austin, TX",
+        )
+
+    def test_unrecognised_shapes_have_no_fast_path(self):
+        self.assertIsNone(fetch_posting("https://boards.greenhouse.io/acme"))
+        self.assertIsNone(fetch_posting("https://careers.example.com/jobs/4012345"))
+
+    def test_api_errors_fall_through(self):
+        self.assertIsNone(fetch_posting("https://boards.greenhouse.io/acme/jobs/999"))
+        self.assertIsNone(
+            fetch_posting("https://jobs.ashbyhq.com/acme/00000000-0000-0000-0000-000000000000")
+        )
+
+    def test_extract_posting_skips_html_fetch(self):
+        with mock.patch("extraction.extractor._extract_from_html") as scrape:
+            posting = extract_posting(
+                "https://jobs.lever.co/acme/0b1c2d3e-1111-2222-3333-444455556666"
+            )
+        scrape.assert_not_called()
+        self.assertEqual(posting["job_title"], "Senior Software Engineer, Platform")
+        self.assertEqual(posting["location"], "San Francisco, CA")
+
+        # metadata is served from the cache on the next call as well
+        cached = extract_posting("https://jobs.lever.co/acme/0b1c2d3e-1111-2222-3333-444455556666/")
+        self.assertEqual(cached, posting)
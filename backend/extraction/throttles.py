@@ -0,0 +1,49 @@
+"""
+Cost estimates for the extraction endpoints (see throttling.buckets).
+
+The estimate covers what is known before the request runs: whether the
+posting is already cached or analyzed. A Chromium render is charged on top
+by the extractor when it actually happens.
+"""
+
+from throttling.buckets import COST_CACHE_HIT, COST_FETCH, COST_LLM, CostThrottle
+
+from .batch import BATCH_MAX_URLS
+from .cache import canonicalize_url, jd_cache
+from .pipeline import has_fresh_analysis
+
+
+def _url(request) -> str:
+    url = request.data.get("url") if hasattr(request.data, "get") else None
+    if not isinstance(url, str) or not url:
+        raise ValueError("no url")
+    return url
+
+
+class ExtractJDThrottle(CostThrottle):
+    scope = "extract_jd"
+
+    def estimate(self, request) -> float:
+        if jd_cache.is_fresh(canonicalize_url(_url(request))):
+            return COST_CACHE_HIT
+        return COST_FETCH
+
+
+class ExtractSkillsThrottle(CostThrottle):
+    scope = "extract_skills"
+
+    def estimate(self, request) -> float:
+        if has_fresh_analysis(_url(request)):
+            return COST_CACHE_HIT
+        return COST_FETCH + COST_LLM
+
+
+class ExtractBatchThrottle(CostThrottle):
+    scope = "extract_batch"
+
+    def estimate(self, request) -> float:
+        # runs before validation: anything but a list is rejected by the view anyway
+        urls = request.data.get("urls")
+        count = min(len(urls), BATCH_MAX_URLS) if isinstance(urls, list) else 0
+        per_url = COST_FETCH + (COST_LLM if request.data.get("analyze", True) else 0)
+        return max(count, 1) * per_url
@@ -5,4 +5,9 @@ from . import views
 urlpatterns = [
     path("extract_jd/", views.extract_jd, name="extract-jd"),
     path("extract_skills/", views.extract_skills, name="extract-skills"),
+    path("extract_skills/stream/", views.extract_skills_stream, name="extract-skills-stream"),
+    path("extract_batch/", views.extract_batch, name="extract-batch"),
+    path("jobs/", views.create_extraction_job, name="extraction-job-create"),
+    path("jobs/<uuid:pk>/", views.extraction_job_status, name="extraction-job-status"),
+    path("stats/", views.extraction_stats, name="extraction-stats"),
 ]
@@ -1,32 +1,42 @@
-import ipaddress
-import socket
+import json
 from urllib.parse import urlparse
 
+from django.db import connections
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from .extractor import analyze_jd, extract_jd_text
+from throttling.buckets import throttle_stats
+
+from .batch import stream_batch
+from .cache import canonicalize_url, jd_cache
+from .condense import condense_stats
+from .extractor import extract_jd_text
+from .hosts import host_limiter
+from .jobs import submit_job, sweep_stale_jobs
+from .llm_cache import analysis_cache
+from .models import ExtractionJob
+from .pipeline import PipelineError, run_skills_pipeline, stream_skills_pipeline
+from .resolver import resolver
 from .serializers import (
+    BatchExtractRequestSerializer,
+    ExtractionJobSerializer,
     ExtractRequestSerializer,
     ExtractResponseSerializer,
 )
-
-MAX_JD_CHARS = 10_000
+from .singleflight import FlightTimeout, flights, streams
+from .throttles import ExtractBatchThrottle, ExtractJDThrottle, ExtractSkillsThrottle
 
 
 def _is_private_host(url: str) -> bool:
-    host = urlparse(url).hostname or ""
-    try:
-        ip = socket.gethostbyname(host)
-        return ipaddress.ip_address(ip).is_private
-    except Exception:
-        return True
+    return not resolver.is_safe(urlparse(url).hostname or "")
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ExtractJDThrottle])
 def extract_jd(request):
     s = ExtractRequestSerializer(data=request.data)
     s.is_valid(raise_exception=True)
@@ -36,17 +46,20 @@ def extract_jd(request):
         return Response({"detail": "Invalid or private host"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        text = extract_jd_text(url)
+        text = flights.do("jd:" + canonicalize_url(url), lambda: extract_jd_text(url))
         MAX_LEN = 80_000
         text = text[:MAX_LEN]
         out = {"url": url, "text": text, "chars": len(text)}
         return Response(ExtractResponseSerializer(out).data, status=status.HTTP_200_OK)
+    except FlightTimeout as e:
+        return Response({"detail": str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
     except Exception as e:
         return Response({"detail": f"extract failed: {e}"}, status=status.HTTP_502_BAD_GATEWAY)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ExtractSkillsThrottle])
 def extract_skills(request):
     req = ExtractRequestSerializer(data=request.data)
     req.is_valid(raise_exception=True)
@@ -56,27 +69,124 @@ def extract_skills(request):
         return Response({"detail": "Invalid or private host"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        jd_text = extract_jd_text(url)[:MAX_JD_CHARS]
-    except Exception as e:
-        return Response({"detail": f"Failed to fetch JD: {e}"}, status=status.HTTP_502_BAD_GATEWAY)
+        # concurrent requests for the same posting share one fetch and one LLM call
+        out = flights.do("skills:" + canonicalize_url(url), lambda: run_skills_pipeline(url))
+    except FlightTimeout as e:
+        return Response({"detail": str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+    except PipelineError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+    out = {**out, "url": url}
+
+    return Response(out, status=status.HTTP_200_OK)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _run_skills_stream(url: str, key: str, publish):
+    def lead():
+        done = None
+        for event, data in stream_skills_pipeline(url):
+            if event == "done":
+                done = data
+            else:
+                publish((event, data))
+        return done
 
     try:
-        analysis = analyze_jd(jd_text)
-    except Exception as e:
-        return Response(
-            {"detail": f"Skill analysis failed: {e}"}, status=status.HTTP_502_BAD_GATEWAY
-        )
+        # shares the run with a plain extract_skills of the same posting, either way round
+        publish(("done", flights.do(key, lead)))
+    finally:
+        connections.close_all()
+
+
+def _skills_events(url: str):
+    key = "skills:" + canonicalize_url(url)
+    try:
+        # concurrent viewers of the same posting replay one pipeline run
+        for event, data in streams.subscribe(
+            key, lambda publish: _run_skills_stream(url, key, publish)
+        ):
+            if event == "done":
+                data = {**data, "url": url}
+            yield _sse(event, data)
+    except FlightTimeout as e:
+        yield _sse("error", {"detail": str(e)})
+    except PipelineError as e:
+        yield _sse("error", {"detail": str(e)})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@throttle_classes([ExtractSkillsThrottle])
+def extract_skills_stream(request):
+    """extract_skills as Server-Sent Events, one event per completed stage."""
+    req = ExtractRequestSerializer(data=request.data)
+    req.is_valid(raise_exception=True)
+    url = req.validated_data["url"]
+
+    if _is_private_host(url):
+        return Response({"detail": "Invalid or private host"}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(_skills_events(url), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # keep proxies from holding events back
+    return response
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@throttle_classes([ExtractBatchThrottle])
+def extract_batch(request):
+    """Extract many postings concurrently, streaming one NDJSON line per URL."""
+    req = BatchExtractRequestSerializer(data=request.data)
+    req.is_valid(raise_exception=True)
+    lines = stream_batch(
+        req.validated_data["urls"], _is_private_host, analyze=req.validated_data["analyze"]
+    )
+    return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@throttle_classes([ExtractSkillsThrottle])
+def create_extraction_job(request):
+    """Queue extract_skills in the background and return the job id right away."""
+    req = ExtractRequestSerializer(data=request.data)
+    req.is_valid(raise_exception=True)
+    url = req.validated_data["url"]
+
+    if _is_private_host(url):
+        return Response({"detail": "Invalid or private host"}, status=status.HTTP_400_BAD_REQUEST)
+
+    job = submit_job(request.user, url)
+    return Response(ExtractionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def extraction_job_status(request, pk):
+    # polling is what notices a job whose worker died
+    sweep_stale_jobs()
+    try:
+        job = ExtractionJob.objects.get(pk=pk, user=request.user)
+    except ExtractionJob.DoesNotExist:
+        return Response({"detail": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ExtractionJobSerializer(job).data, status=status.HTTP_200_OK)
+
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def extraction_stats(request):
     out = {
-        "url": url,
-        "job_title": analysis.get("job_title", "Not specified"),
-        "company": analysis.get("company", "Not specified"),
-        "location": analysis.get("location", "Not specified"),
-        "responsibilities": analysis.get("responsibilities", []),
-        "requirements": analysis.get("requirements", []),
-        "categories": analysis.get("categories", []),
-        "flat": analysis.get("flat", []),
-        "leetcode_recommendations": analysis.get("leetcode_recommendations", []),
-        "jd_chars": len(jd_text),
+        "jd_cache": jd_cache.stats(),
+        "dns": resolver.stats(),
+        "hosts": host_limiter.stats(),
+        "single_flight": flights.stats(),
+        "single_flight_streams": streams.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "condense": condense_stats.stats(),
+        "throttle": throttle_stats.stats(),
     }
     return Response(out, status=status.HTTP_200_OK)
@@ -4,6 +4,7 @@ from pathlib import Path
 from django.core.management.base import BaseCommand
 
 from leetcode.models import LeetCodeProblem
+from leetcode.recommender import reset_problem_index
 
 
 class Command(BaseCommand):
@@ -38,6 +39,7 @@ class Command(BaseCommand):
             else:
                 updated += 1
 
+        reset_problem_index()
         self.stdout.write(
             self.style.SUCCESS(f"Loaded {total} problems ({created} created, {updated} updated)")
         )
@@ -0,0 +1,264 @@
+"""
+LeetCode recommendations grounded in the LeetCodeProblem catalog.
+
+Extracted skills are mapped to weighted LeetCode topic tags (by skill first,
+then by skill category). Problems are scored through a tag -> problem
+inverted index built from the table (and rebuilt every PROBLEM_INDEX_TTL
+seconds, so a catalog reload reaches every process), and picks are made
+per difficulty slot so the mix follows the role's seniority. Every
+recommendation is a real row, with its own number, title and URL.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+
+from django.db import DatabaseError
+
+from .models import LeetCodeProblem
+
+RECOMMENDATION_COUNT = 3
+PROBLEM_INDEX_TTL = float(os.getenv("LEETCODE_INDEX_TTL", "600"))
+CLASSIC_SCALE = 1000
+
+# skill (as named in the extraction taxonomy) -> {tag: weight}
+SKILL_TAGS = {
+    "SQL": {"Database": 3},
+    "PostgreSQL": {"Database": 3},
+    "MySQL": {"Database": 3},
+    "SQL Server": {"Database": 3},
+    "Oracle Database": {"Database": 3},
+    "Snowflake": {"Database": 2, "Sorting": 1},
+    "BigQuery": {"Database": 2, "Sorting": 1},
+    "Redshift": {"Database": 2, "Sorting": 1},
+    "Redis": {"Design": 2, "Hash Table": 2, "Doubly-Linked List": 1},
+    "Memcached": {"Design": 2, "Hash Table": 2, "Doubly-Linked List": 1},
+    "Kafka": {"Queue": 2, "Data Stream": 2, "Design": 1},
+    "RabbitMQ": {"Queue": 2, "Design": 1},
+    "Pub/Sub": {"Queue": 2, "Data Stream": 1},
+    "Kinesis": {"Data Stream": 2, "Queue": 1},
+    "Spark": {"Sorting": 1, "Hash Table": 1, "Heap (Priority Queue)": 1},
+    "Hadoop": {"Sorting": 1, "Hash Table": 1, "Divide and Conquer": 1},
+    "Flink": {"Data Stream": 2, "Sliding Window": 2},
+    "Bash": {"Shell": 3},
+    "Linux": {"Shell": 2},
+    "Go": {"Concurrency": 2},
+    "Java": {"Concurrency": 1, "Design": 1},
+    "C++": {"Bit Manipulation": 1, "Design": 1},
+    "C": {"Bit Manipulation": 2, "Linked List": 1},
+    "Rust": {"Bit Manipulation": 1, "Concurrency": 1},
+    "Embedded Systems": {"Bit Manipulation": 3, "Bitmask": 1},
+    "RTOS": {"Bit Manipulation": 2, "Queue": 1, "Concurrency": 1},
+    "FPGA": {"Bit Manipulation": 3},
+    "Verilog": {"Bit Manipulation": 3},
+    "DSP": {"Math": 2, "Array": 1},
+    "React": {"Tree": 2, "Stack": 1, "Design": 1},
+    "Angular": {"Tree": 2, "Design": 1},
+    "Vue": {"Tree": 2, "Design": 1},
+    "HTML": {"Tree": 1, "String": 1, "Stack": 1},
+    "JavaScript": {"String": 1, "Hash Table": 1},
+    "TypeScript": {"String": 1, "Hash Table": 1},
+    "GraphQL": {"Graph": 1, "Tree": 1},
+    "REST APIs": {"Design": 2, "Hash Table": 1},
+    "gRPC": {"Design": 1},
+    "Kubernetes": {"Graph": 1, "Topological Sort": 1, "Heap (Priority Queue)": 1},
+    "Terraform": {"Topological Sort": 2, "Graph": 1},
+    "Airflow": {"Topological Sort": 3, "Graph": 2},
+    "dbt": {"Topological Sort": 2, "Database": 1},
+    "Machine Learning": {"Math": 2, "Matrix": 2, "Probability and Statistics": 2},
+    "Deep Learning": {"Matrix": 2, "Math": 1},
+    "Statistics": {"Probability and Statistics": 3, "Math": 1, "Randomized": 1},
+    "A/B Testing": {"Probability and Statistics": 2, "Randomized": 1},
+    "NumPy": {"Matrix": 2, "Array": 1},
+    "Pandas": {"Database": 1, "Sorting": 1, "Hash Table": 1},
+    "Computer Vision": {"Matrix": 3, "Breadth-First Search": 1},
+    "NLP": {"String": 2, "Trie": 2, "String Matching": 1},
+    "LLMs": {"String": 1, "Trie": 1, "Heap (Priority Queue)": 1},
+    "Elasticsearch": {"Trie": 2, "String Matching": 1, "Heap (Priority Queue)": 1},
+    "Neo4j": {"Graph": 3, "Shortest Path": 1},
+    "Cryptography": {"Bit Manipulation": 2, "Number Theory": 2, "Math": 1},
+    "Cassandra": {"Hash Function": 1, "Design": 1},
+    "Unity": {"Geometry": 2, "Matrix": 1, "Simulation": 1},
+    "Unreal Engine": {"Geometry": 2, "Matrix": 1, "Simulation": 1},
+    "ROS": {"Graph": 1, "Shortest Path": 2, "Geometry": 1},
+}
+
+# fallback for skills without their own entry
+CATEGORY_TAGS = {
+    "Languages": {"Array": 1, "String": 1, "Hash Table": 1},
+    "Frameworks": {"Design": 1, "Hash Table": 1},
+    "Web": {"String": 1, "Stack": 1, "Tree": 1},
+    "Mobile": {"Design": 1, "Array": 1},
+    "Cloud": {"Design": 1, "Heap (Priority Queue)": 1, "Graph": 1},
+    "Databases": {"Database": 2, "Hash Table": 1},
+    "DevOps": {"Graph": 1, "Queue": 1, "Simulation": 1},
+    "Data/AI": {"Math": 1, "Array": 1, "Dynamic Programming": 1},
+    "Testing": {"Simulation": 1, "String": 1},
+    "Security": {"Bit Manipulation": 1, "String": 1, "Hash Function": 1},
+    "Hardware/Embedded": {"Bit Manipulation": 2},
+    "Design/UX": {"Matrix": 1, "Geometry": 1},
+    "Tools": {"String": 1},
+    "CRM/ERP": {"Database": 1, "Hash Table": 1},
+    "Domain/Compliance": {"Hash Table": 1},
+}
+
+# every interview touches these; they keep a sparse skill list from coming back empty
+BASELINE_TAGS = {
+    "Array": 0.5,
+    "Hash Table": 0.5,
+    "String": 0.3,
+    "Two Pointers": 0.3,
+    "Dynamic Programming": 0.3,
+    "Binary Search": 0.3,
+}
+
+# tags that only make sense when a skill asks for them
+OPT_IN_TAGS = {"Database", "Shell", "Concurrency", "Interactive"}
+
+DIFFICULTY_MIX = {
+    "junior": ("Easy", "Easy", "Medium"),
+    "mid": ("Easy", "Medium", "Hard"),
+    "senior": ("Medium", "Medium", "Hard"),
+}
+SENIOR_RE = re.compile(r"\b(senior|sr\.?|staff|principal|lead|architect|manager)\b", re.I)
+JUNIOR_RE = re.compile(
+    r"\b(intern|internship|junior|jr\.?|new grad|graduate|entry[- ]level)\b", re.I
+)
+
+
+def seniority(title: str) -> str:
+    if SENIOR_RE.search(title or ""):
+        return "senior"
+    if JUNIOR_RE.search(title or ""):
+        return "junior"
+    return "mid"
+
+
+class ProblemIndex:
+    """Problem rows plus a tag -> problem_id inverted index."""
+
+    def __init__(self, rows):
+        self.problems = {}
+        self.by_tag = {}
+        for row in rows:
+            pid = row["problem_id"]
+            self.problems[pid] = row
+            for tag in row["tags"] or []:
+                self.by_tag.setdefault(tag, []).append(pid)
+
+    def tag_weights(self, categories: list) -> tuple:
+        """Return ``({tag: weight}, {tag: skill that asked for it})`` for the analysis categories."""
+        weights = dict(BASELINE_TAGS)
+        reasons = {}
+        for category in categories:
+            for skill in category.get("skills", []):
+                tags = SKILL_TAGS.get(skill) or CATEGORY_TAGS.get(category.get("name"), {})
+                for tag, weight in tags.items():
+                    weights[tag] = weights.get(tag, 0) + weight
+                    reasons.setdefault(tag, skill)
+        return weights, reasons
+
+    def score(self, weights: dict) -> dict:
+        scores = {}
+        for tag, weight in weights.items():
+            for pid in self.by_tag.get(tag, ()):
+                scores[pid] = scores.get(pid, 0.0) + weight
+        for pid in list(scores):
+            tags = self.problems[pid]["tags"]
+            if any(t in OPT_IN_TAGS and t not in weights for t in tags):
+                del scores[pid]
+                continue
+            # favour problems that are mostly about the requested topics, and older,
+            # better known problems (lower numbers) over recent contest ones
+            scores[pid] /= math.sqrt(len(tags)) * (1 + pid / CLASSIC_SCALE)
+        return scores
+
+    def recommend(self, categories: list, job_title: str = "", count: int = RECOMMENDATION_COUNT):
+        weights, reasons = self.tag_weights(categories)
+        scores = self.score(weights)
+        ranked = sorted(scores, key=lambda pid: (-scores[pid], pid))
+        mix = DIFFICULTY_MIX[seniority(job_title)]
+        slots = (mix * (count // len(mix) + 1))[:count]
+
+        picks = []
+        covered = set()
+        for difficulty in slots:
+            best, best_score = None, 0.0
+            for pid in ranked:
+                if scores[pid] <= best_score:
+                    break
+                row = self.problems[pid]
+                if row["difficulty"] != difficulty or pid in picks:
+                    continue
+                # prefer topics not covered by an earlier pick
+                matched = [t for t in row["tags"] if t in weights]
+                fresh = sum(weights[t] for t in matched if t not in covered)
+                adjusted = scores[pid] * (0.3 + 0.7 * fresh / sum(weights[t] for t in matched))
+                if adjusted > best_score:
+                    best, best_score = pid, adjusted
+            if best is not None:
+                picks.append(best)
+                covered.update(self.problems[best]["tags"])
+
+        return [self._recommendation(self.problems[pid], weights, reasons) for pid in picks]
+
+    def _recommendation(self, row, weights: dict, reasons: dict) -> dict:
+        matched = sorted(
+            (t for t in row["tags"] if t in weights), key=lambda t: -weights.get(t, 0)
+        )[:2]
+        skills = [reasons[t] for t in matched if t in reasons]
+        topics = " and ".join(matched) or "core data structures"
+        reason = f"Practices {topics}"
+        if skills:
+            reason += f", relevant to the {', '.join(dict.fromkeys(skills))} work in this role"
+        return {
+            "problem_name": row["title"],
+            "problem_number": row["problem_id"],
+            "difficulty": row["difficulty"],
+            "reason": reason + ".",
+            "url": row["url"],
+        }
+
+
+_index = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_problem_index() -> ProblemIndex:
+    global _index, _built_at
+    with _lock:
+        # an empty table is not cached, so problems loaded later are picked up;
+        # the TTL does the same for reloads run in another process
+        if (
+            _index is None
+            or not _index.problems
+            or time.monotonic() - _built_at >= PROBLEM_INDEX_TTL
+        ):
+            rows = LeetCodeProblem.objects.values(
+                "problem_id", "title", "difficulty", "tags", "url"
+            )
+            _index = ProblemIndex(list(rows))
+            _built_at = time.monotonic()
+        return _index
+
+
+def reset_problem_index():
+    """Drop this process's cached index, e.g. after reloading the problem table.
+
+    Other processes pick the reload up within PROBLEM_INDEX_TTL.
+    """
+    global _index
+    with _lock:
+        _index = None
+
+
+def recommend_problems(categories: list, job_title: str = "") -> list:
+    try:
+        index = get_problem_index()
+    except DatabaseError as e:
+        print(f"LeetCode catalog unavailable: {e}")
+        return []
+    return index.recommend(categories, job_title)
@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
+from api.disconnect import DisconnectWatcher
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
 
 application = get_asgi_application()
+
+if settings.DEBUG:
+    # what runserver does for static files, for the admin under uvicorn
+    application = ASGIStaticFilesHandler(application)
+
+# lets streaming views (api.views.chat_stream) cancel upstream calls on disconnect
+application = DisconnectWatcher(application)
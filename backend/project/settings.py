@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     "ai",
     "extraction",
     "leetcode",
+    "throttling",
 ]
 
 REST_FRAMEWORK = {
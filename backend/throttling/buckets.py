@@ -0,0 +1,182 @@
+"""
+Cost-weighted token-bucket throttling for the expensive endpoints.
+
+This module is shared by the apps it throttles (api for chat, extraction);
+each defines its own CostThrottle subclasses and cost estimates.
+
+Every client (user id, or IP for anonymous requests) has one bucket of
+THROTTLE_CAPACITY tokens that refills at THROTTLE_REFILL_PER_MINUTE, shared
+by chat and the extraction endpoints. A request is let in only if its
+estimated cost is available: a cache hit costs COST_CACHE_HIT, a fetch plus
+LLM analysis much more. Work that turns out dearer than estimated, such as
+a Chromium render, is charged with record_cost() while the request runs and
+can take the bucket negative, which delays that client's next requests.
+Work that continues off the request thread (batch workers, background
+jobs) runs under charging(key) or a copied context so it is charged too.
+A request estimated above THROTTLE_CAPACITY (a large batch) waits for a
+full bucket and is then charged its estimate; debt stops at -THROTTLE_CAPACITY.
+
+Buckets are rows in the ThrottleBucket table, so every worker process sees
+the same state. If the table is unavailable requests are let through.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.signals import request_started
+from django.db import DatabaseError, transaction
+from rest_framework.throttling import BaseThrottle
+
+from .models import ThrottleBucket
+
+THROTTLE_CAPACITY = float(os.getenv("THROTTLE_CAPACITY", "60"))
+THROTTLE_REFILL_PER_MINUTE = float(os.getenv("THROTTLE_REFILL_PER_MINUTE", "30"))
+
+COST_CACHE_HIT = 1
+COST_CHAT = 3
+COST_FETCH = 3
+COST_LLM = 5
+COST_RENDER = 10
+
+# bucket of the request being handled in this context, for record_cost()
+_current_key = contextvars.ContextVar("throttle_key", default=None)
+
+
+def user_key(user_id) -> str:
+    return f"user:{user_id}"
+
+
+@contextmanager
+def charging(key: str):
+    """Charge record_cost() calls made inside the block to ``key``."""
+    token = _current_key.set(key)
+    try:
+        yield
+    finally:
+        _current_key.reset(token)
+
+
+def _reset_current_key(**kwargs):
+    # WSGI threads are reused, so a previous request's key must not leak
+    _current_key.set(None)
+
+
+request_started.connect(_reset_current_key, dispatch_uid="throttling.buckets.reset")
+
+
+class TokenBucket:
+    def __init__(
+        self, capacity: float = THROTTLE_CAPACITY, per_minute: float = THROTTLE_REFILL_PER_MINUTE
+    ):
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    def _update(self, key: str, cost: float, force: bool) -> float:
+        now = time.time()
+        with transaction.atomic():
+            bucket, _ = ThrottleBucket.objects.select_for_update().get_or_create(
+                key=key, defaults={"tokens": self.capacity, "updated_at": now}
+            )
+            tokens = min(self.capacity, bucket.tokens + (now - bucket.updated_at) * self.rate)
+            wait = 0.0
+            # a request dearer than the whole bucket needs it full, then leaves it in
+            # debt; debt never goes past one bucket, so one request costs a client at
+            # most two refill periods
+            needed = min(cost, self.capacity)
+            if force or tokens >= needed:
+                tokens = min(max(tokens - cost, -self.capacity), self.capacity)
+            else:
+                wait = (needed - tokens) / self.rate
+            bucket.tokens = tokens
+            bucket.updated_at = now
+            bucket.save(update_fields=["tokens", "updated_at"])
+        return wait
+
+    def take(self, key: str, cost: float) -> float:
+        """Spend ``cost`` if the bucket has it and return 0, else the seconds to wait.
+
+        A cost above capacity is admitted once the bucket is full and charged
+        in full, down to a debt of one whole bucket.
+        """
+        return self._update(key, cost, force=False)
+
+    def charge(self, key: str, cost: float):
+        """Spend ``cost`` unconditionally, for work already done."""
+        self._update(key, cost, force=True)
+
+
+bucket = TokenBucket()
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.scopes = {}
+
+    def record(self, scope: str, cost: float, allowed: bool):
+        with self._lock:
+            s = self.scopes.setdefault(scope, {"allowed": 0, "throttled": 0, "cost": 0.0})
+            s["allowed" if allowed else "throttled"] += 1
+            s["cost"] += cost if allowed else 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: {**s, "cost": round(s["cost"], 1)} for name, s in self.scopes.items()}
+
+
+throttle_stats = _Stats()
+
+
+def record_cost(cost: float, scope: str = "render"):
+    """Charge extra work to the client whose request is running, if any.
+
+    A negative ``cost`` refunds part of an estimate that turned out too high.
+    """
+    key = _current_key.get()
+    if key is None:
+        return
+    try:
+        bucket.charge(key, cost)
+    except DatabaseError as e:
+        print(f"throttle store unavailable: {e}")
+        return
+    throttle_stats.record(scope, cost, True)
+
+
+class CostThrottle(BaseThrottle):
+    """DRF throttle over the shared token bucket; subclasses set ``scope`` and ``estimate``."""
+
+    scope = "default"
+
+    def estimate(self, request) -> float:
+        return 1
+
+    def client_key(self, request) -> str:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user_key(user.pk)
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view) -> bool:
+        key = self.client_key(request)
+        try:
+            cost = self.estimate(request)
+        except Exception as e:  # a bad payload is the view's to reject
+            print(f"cost estimate failed: {e}")
+            cost = 1
+        try:
+            self._wait = bucket.take(key, cost)
+        except DatabaseError as e:
+            print(f"throttle store unavailable: {e}")
+            self._wait = 0.0
+        allowed = self._wait == 0
+        throttle_stats.record(self.scope, cost, allowed)
+        if allowed:
+            _current_key.set(key)
+        return allowed
+
+    def wait(self):
+        return self._wait
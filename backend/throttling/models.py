@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class ThrottleBucket(models.Model):
+    """Token-bucket state for throttling.buckets, one row per client."""
+
+    key = models.CharField(max_length=200, primary_key=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()  # unix time of the last refill
+
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.1f}"
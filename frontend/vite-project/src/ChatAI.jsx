@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import "./ChatAI.css";
+import { readSSE } from "./sse";
 
 function ChatAI() {
   const navigate = useNavigate();
@@ -9,6 +10,8 @@ function ChatAI() {
   const [isLoading, setIsLoading] = useState(false);
   const [_error, setError] = useState("");
   const messagesEndRef = useRef(null);
+  const abortRef = useRef(null);
+  const conversationIdRef = useRef(null);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -18,6 +21,9 @@ function ChatAI() {
     scrollToBottom();
   }, [messages]);
 
+  // leaving the page drops the stream, which cancels the request upstream
+  useEffect(() => () => abortRef.current?.abort(), []);
+
   const handleSend = async (e) => {
     e.preventDefault();
     if (!inputValue.trim() || isLoading) return;
@@ -36,37 +42,68 @@ function ChatAI() {
     setError("");
 
     try {
-      const conversationHistory = messages.slice(-10).map((msg) => ({
-        role: msg.sender === "user" ? "user" : "assistant",
-        content: msg.text,
-      }));
+      const token = localStorage.getItem("token");
+      const headers = { "Content-Type": "application/json" };
+      // signed in: the server keeps the history, so only the new message is sent
+      const requestBody = token
+        ? { message: userInput, conversation_id: conversationIdRef.current }
+        : {
+            message: userInput,
+            conversation_history: messages.slice(-10).map((msg) => ({
+              role: msg.sender === "user" ? "user" : "assistant",
+              content: msg.text,
+            })),
+          };
+      if (token) {
+        headers.Authorization = `Token ${token}`;
+      }
+
+      const controller = new AbortController();
+      abortRef.current = controller;
 
-      const response = await fetch("http://localhost:8000/api/chat/", {
+      const response = await fetch("http://localhost:8000/api/chat/stream/", {
         method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          message: userInput,
-          conversation_history: conversationHistory,
-        }),
+        headers,
+        body: JSON.stringify(requestBody),
+        signal: controller.signal,
       });
 
-      const data = await response.json();
-
       if (!response.ok) {
+        const data = await response.json();
         throw new Error(data.error || "Failed to get AI response");
       }
 
-      const aiMessage = {
-        id: Date.now() + 1,
-        text: data.response,
-        sender: "ai",
-        timestamp: new Date().toLocaleTimeString(),
-      };
-
-      setMessages((prev) => [...prev, aiMessage]);
+      const aiMessageId = Date.now() + 1;
+      const appendToAiMessage = (text) =>
+        setMessages((prev) => {
+          if (!prev.some((msg) => msg.id === aiMessageId)) {
+            return [
+              ...prev,
+              {
+                id: aiMessageId,
+                text,
+                sender: "ai",
+                timestamp: new Date().toLocaleTimeString(),
+              },
+            ];
+          }
+          return prev.map((msg) =>
+            msg.id === aiMessageId ? { ...msg, text: msg.text + text } : msg,
+          );
+        });
+
+      // server-sent events: a "token" per chunk, then "done" or "error"
+      await readSSE(response, (event, payload) => {
+        if (event === "conversation") {
+          conversationIdRef.current = payload.conversation_id;
+        } else if (event === "token") {
+          appendToAiMessage(payload.text);
+        } else if (event === "error") {
+          throw new Error(payload.error);
+        }
+      });
     } catch (error) {
+      if (error.name === "AbortError") return;
       console.error("Error sending message:", error);
       setError(error.message || "Failed to get AI response");
       const errorMessage = {
@@ -112,7 +149,7 @@ function ChatAI() {
             </div>
           ))
         )}
-        {isLoading && (
+        {isLoading && messages[messages.length - 1]?.sender === "user" && (
           <div className="message ai-message">
             <div className="message-content">
               <p>Thinking...</p>
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import "./TrackerMain.css";
+import { readSSE } from "./sse";
 
 function TrackerMain() {
   const navigate = useNavigate();
@@ -133,9 +134,33 @@ function TrackerMain() {
     setJdError("");
     setJdData(null);
 
+    // map of backend field names to jdData keys
+    const fieldNames = {
+      url: "url",
+      job_title: "jobTitle",
+      company: "company",
+      location: "location",
+      responsibilities: "responsibilities",
+      requirements: "requirements",
+      categories: "categories",
+      flat: "flat",
+      leetcode_recommendations: "leetcodeRecommendations",
+    };
+    const mergeFields = (fields) =>
+      setJdData((prev) => {
+        const next = { ...(prev || {}) };
+        Object.entries(fields).forEach(([name, value]) => {
+          if (fieldNames[name]) {
+            next[fieldNames[name]] = value;
+          }
+        });
+        return next;
+      });
+
     try {
+      // server-sent events: posting metadata, local skills, then the LLM fields as they arrive
       const skillsResponse = await fetch(
-        "http://localhost:8000/extraction/extract_skills/",
+        "http://localhost:8000/extraction/extract_skills/stream/",
         {
           method: "POST",
           headers: {
@@ -150,19 +175,19 @@ function TrackerMain() {
         throw new Error("Failed to fetch skills");
       }
 
-      const skillsResult = await skillsResponse.json();
-
-      setJdData({
-        url: skillsResult.url,
-        jobTitle: skillsResult.job_title,
-        company: skillsResult.company,
-        location: skillsResult.location,
-        responsibilities: skillsResult.responsibilities || [],
-        requirements: skillsResult.requirements || [],
-        categories: skillsResult.categories || [],
-        flat: skillsResult.flat || [],
-        leetcodeRecommendations: skillsResult.leetcode_recommendations || [],
+      const finished = await readSSE(skillsResponse, (event, payload) => {
+        if (event === "posting" || event === "skills" || event === "done") {
+          mergeFields(payload);
+        } else if (event === "field") {
+          mergeFields({ [payload.name]: payload.value });
+        } else if (event === "error") {
+          throw new Error(payload.detail);
+        }
       });
+
+      if (!finished) {
+        throw new Error("Stream ended early");
+      }
     } catch (error) {
       console.error("Error fetching job description:", error);
       setJdError(
@@ -344,7 +369,7 @@ function TrackerMain() {
               <p className="jd-placeholder">No job description fetched yet.</p>
             )}
 
-            {jdLoading && (
+            {jdLoading && !jdData && (
               <div className="jd-loading">
                 <div className="loading-spinner"></div>
                 <p>Fetching job description...</p>
@@ -357,7 +382,7 @@ function TrackerMain() {
               </div>
             )}
 
-            {jdData && !jdLoading && (
+            {jdData && (
               <div className="jd-card">
                 <div className="jd-header">
                   <div className="jd-title-block">
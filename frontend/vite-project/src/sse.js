@@ -0,0 +1,39 @@
+// Reads a server-sent event stream from a fetch response.
+// Calls onEvent(event, payload) for each event, with the JSON data parsed,
+// and stops after the "done" event. Returns whether "done" arrived, so
+// callers can tell a finished stream from one that was cut off.
+export async function readSSE(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) return false;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const chunk = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      let data = "";
+      chunk.split("\n").forEach((line) => {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        if (line.startsWith("data: ")) data += line.slice(6);
+      });
+      try {
+        onEvent(event, data ? JSON.parse(data) : {});
+      } catch (error) {
+        reader.cancel();
+        throw error;
+      }
+
+      if (event === "done") {
+        reader.cancel();
+        return true;
+      }
+    }
+  }
+}